@@ -10,6 +10,8 @@ class ArticleAdmin(admin.ModelAdmin):
     prepopulated_fields = {'slug': ('title',)}
     ordering = ('-published_at',)
     list_select_related = ('author', 'category')
+    # hisoblagichlarni ViewCounter, signallar va rollup yozadi, save() ularni yozmaydi
+    readonly_fields = ("view_count", "comment_count", "unique_visitors")
 
 
 @admin.register(Category)
@@ -2,6 +2,8 @@ from .for_readers import (
     CategoryListAPIView,
     CategoryArticleListAPIView,
     ArticleListAPIView,
+    ArticleAutocompleteAPIView,
+    ArticleTrendingAPIView,
     ArticleDetailAPIView,
     TagListAPIView,
     ArticlesByTagAPIView,
@@ -10,5 +12,6 @@ from .for_readers import (
 ) # noqa
 from .for_editors import (
     ArticleListCreateAPIView,
-    ArticleRetrieveUpdateDestroyAPIView
+    ArticleRetrieveUpdateDestroyAPIView,
+    ArticleViewStatsAPIView
 ) # noqa
\ No newline at end of file
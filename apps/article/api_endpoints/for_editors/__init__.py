@@ -1,4 +1,5 @@
 from .views import (
     ArticleListCreateAPIView,
-    ArticleRetrieveUpdateDestroyAPIView
+    ArticleRetrieveUpdateDestroyAPIView,
+    ArticleViewStatsAPIView
 ) # noqa
\ No newline at end of file
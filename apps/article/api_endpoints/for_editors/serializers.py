@@ -1,5 +1,11 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
 from rest_framework import serializers
-from apps.article.models import Article, Category, Tag
+
+from apps.article.models import Article, ArticleVisitorStat, Category, Tag
+
 
 # Teg nomini qabul qilib, uni bazadan qidiradigan yoki yangi yaratadigan maxsus maydon
 class CreatableSlugRelatedField(serializers.SlugRelatedField):
@@ -35,7 +41,8 @@ class ArticleListSerializer(serializers.ModelSerializer):
         model = Article
         fields = [
             'id', 'title', 'slug', 'excerpt', 'featured_image', 
-            'author', 'category', 'tags', 'status', 'published_at', 'view_count'
+            'author', 'category', 'tags', 'status', 'published_at', 'view_count',
+            'unique_visitors'
         ]
         read_only_fields = ['slug', 'published_at', 'view_count', 'author']
 
@@ -80,17 +87,48 @@ class ArticleCreateUpdateSerializer(serializers.ModelSerializer):
         
         return instance
     
+class ArticleVisitorStatSerializer(serializers.ModelSerializer):
+    """Kunlik noyob tashrif buyuruvchilar uchun serializer."""
+
+    class Meta:
+        model = ArticleVisitorStat
+        fields = ["date", "visitors"]
+
+
+class ArticleViewStatSerializer(serializers.Serializer):
+    """Soatlik ko'rishlar grafigining bitta nuqtasi (soat boshi)."""
+
+    bucket = serializers.DateTimeField(source="hour")
+    views = serializers.IntegerField(source="total")
+
+
+class ArticleDailyViewStatSerializer(serializers.Serializer):
+    """Kunlik ko'rishlar grafigining bitta nuqtasi."""
+
+    bucket = serializers.DateField(source="date")
+    views = serializers.IntegerField(source="total")
+
+
 class ArticleDetailSerializer(serializers.ModelSerializer):
     """Maqola tafsilotlari uchun serializer."""
     author = serializers.CharField(source='author.username', read_only=True)
     category = CategorySerializer(read_only=True)
     tags = TagSerializer(many=True, read_only=True)
+    daily_visitors = serializers.SerializerMethodField()
 
     class Meta:
         model = Article
         fields = [
             'id', 'title', 'slug', 'content', 'excerpt', 'featured_image', 
-            'author', 'category', 'tags', 'status', 'published_at', 'view_count'
+            'author', 'category', 'tags', 'status', 'published_at', 'view_count',
+            'unique_visitors', 'daily_visitors'
         ]
         read_only_fields = ['slug', 'published_at', 'view_count', 'author']
 
+    def get_daily_visitors(self, obj):
+        """Oxirgi ARTICLE_VISITOR_STATS_DAYS kunning noyob tashrif buyuruvchilari."""
+        since = timezone.localdate() - timedelta(
+            days=settings.ARTICLE_VISITOR_STATS_DAYS - 1
+        )
+        stats = obj.visitor_stats.filter(date__gte=since).order_by("date")
+        return ArticleVisitorStatSerializer(stats, many=True).data
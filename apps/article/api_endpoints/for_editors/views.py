@@ -4,16 +4,41 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.exceptions import PermissionDenied # <-- Yaxshiroq xatolik uchun
 from rest_framework.parsers import MultiPartParser, FormParser
+from datetime import timedelta
+
+from django.conf import settings
 from django.shortcuts import get_object_or_404
+from django.utils import timezone
 from apps.article.models import Article
+from apps.article.services.view_stats import ViewStats, current_hour
 from .serializers import (
     ArticleListSerializer,
     ArticleCreateUpdateSerializer,
-    ArticleDetailSerializer
+    ArticleDetailSerializer,
+    ArticleViewStatSerializer,
+    ArticleDailyViewStatSerializer,
 )
 from .permissions import IsEditorOrAdmin
 from drf_yasg.utils import swagger_auto_schema
 
+# ArticleListSerializer chiqaradigan ustunlar (matn va qidiruv ustunlarisiz)
+ARTICLE_LIST_FIELDS = (
+    "id",
+    "title",
+    "slug",
+    "excerpt",
+    "featured_image",
+    "status",
+    "published_at",
+    "view_count",
+    "unique_visitors",
+    "author__username",
+    "category__id",
+    "category__name",
+    "category__slug",
+)
+
+
 # Maqolalar ro'yxatini ko'rish va yangi maqola yaratish uchun
 class ArticleListCreateAPIView(APIView):
     permission_classes = [IsAuthenticated, IsEditorOrAdmin]
@@ -24,6 +49,7 @@ class ArticleListCreateAPIView(APIView):
             Article.objects.filter(author=request.user)
             .select_related("author", "category")   
             .prefetch_related("tags")               
+            .only(*ARTICLE_LIST_FIELDS)
             .order_by("-published_at")
         )
         serializer = ArticleListSerializer(articles, many=True)
@@ -58,6 +84,7 @@ class ArticleRetrieveUpdateDestroyAPIView(APIView):
         article = (
             Article.objects.select_related("author", "category")
             .prefetch_related("tags")
+            .defer(*Article.TRANSLITERATED_COPY_FIELDS, *Article.SEARCH_COLUMNS)
             .get(pk=pk)
         )
         serializer = ArticleDetailSerializer(article)
@@ -86,4 +113,53 @@ class ArticleRetrieveUpdateDestroyAPIView(APIView):
         article.delete()
         return Response(status=status.HTTP_204_NO_CONTENT)
 
-__all__ = ['ArticleListCreateAPIView', 'ArticleRetrieveUpdateDestroyAPIView']
+
+# Maqola ko'rishlari grafigi uchun
+class ArticleViewStatsAPIView(APIView):
+    """
+    GET /api/editor/articles/<pk>/stats/?period=day|hour&days=<son>
+    Oldindan jamlangan soatlik (ArticleViewStat) yoki kunlik (ArticleDailyViewStat)
+    ko'rishlar; days saqlash muddatidan oshmaydi.
+    """
+
+    permission_classes = [IsAuthenticated, IsEditorOrAdmin]
+    default_days = {"hour": 2, "day": 30}
+
+    def get(self, request, pk):
+        article = get_object_or_404(Article.objects.only("id", "author_id"), pk=pk)
+        if article.author_id != request.user.pk:
+            raise PermissionDenied(
+                "Sizda bu maqola statistikasini ko'rishga ruxsat yo'q."
+            )
+
+        period = request.query_params.get("period", "day")
+        if period not in self.default_days:
+            return Response(
+                {"period": ["'hour' yoki 'day' bo'lishi kerak."]},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        try:
+            days = int(request.query_params.get("days", self.default_days[period]))
+        except ValueError:
+            days = self.default_days[period]
+
+        if period == "hour":
+            days = max(1, min(days, settings.ARTICLE_VIEW_STATS_HOURLY_RETENTION))
+            since = current_hour() - timedelta(days=days)
+            stats = ArticleViewStatSerializer(
+                ViewStats.hourly(article.pk, since), many=True
+            )
+        else:
+            days = max(1, min(days, settings.ARTICLE_VIEW_STATS_DAILY_RETENTION))
+            since = timezone.localdate() - timedelta(days=days - 1)
+            stats = ArticleDailyViewStatSerializer(
+                ViewStats.daily(article.pk, since), many=True
+            )
+        return Response({"period": period, "days": days, "results": stats.data})
+
+
+__all__ = [
+    "ArticleListCreateAPIView",
+    "ArticleRetrieveUpdateDestroyAPIView",
+    "ArticleViewStatsAPIView",
+]
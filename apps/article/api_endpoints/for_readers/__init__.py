@@ -1,3 +1,3 @@
 from .views import (
-    CategoryListAPIView, CategoryArticleListAPIView, ArticleListAPIView, ArticleDetailAPIView, TagListAPIView, ArticlesByTagAPIView, ArticlesByCategoryAPIView, ArticleCommentsAPIView
+    CategoryListAPIView, CategoryArticleListAPIView, ArticleListAPIView, ArticleAutocompleteAPIView, ArticleTrendingAPIView, ArticleDetailAPIView, TagListAPIView, ArticlesByTagAPIView, ArticlesByCategoryAPIView, ArticleCommentsAPIView
 )
\ No newline at end of file
@@ -1,9 +1,11 @@
 import django_filters
+from django.db.models import Exists, OuterRef
+
 from apps.article.models import Article
 
 class ArticleFilter(django_filters.FilterSet):
     category = django_filters.CharFilter(field_name="category__slug", lookup_expr="iexact")
-    tag = django_filters.CharFilter(field_name="tags__slug", lookup_expr="iexact")
+    tag = django_filters.CharFilter(method="filter_tag")
     author = django_filters.CharFilter(field_name="author__username", lookup_expr="iexact")
     date_from = django_filters.DateFilter(field_name="published_at", lookup_expr="gte")
     date_to = django_filters.DateFilter(field_name="published_at", lookup_expr="lte")
@@ -11,3 +13,13 @@ class ArticleFilter(django_filters.FilterSet):
     class Meta:
         model = Article
         fields = ["category", "tag", "author", "date_from", "date_to"]
+
+    def filter_tag(self, queryset, name, value):
+        # M2M join o'rniga Exists: maqola qatorlari ko'paymaydi, DISTINCT kerak emas
+        return queryset.filter(
+            Exists(
+                Article.tags.through.objects.filter(
+                    article=OuterRef("pk"), tag__slug__iexact=value
+                )
+            )
+        )
@@ -1,7 +1,11 @@
+import math
+from collections import defaultdict
+
 from rest_framework import serializers
+from rest_framework.settings import api_settings
 from apps.article.models import Category, Tag, Article, Comment
+from apps.text_services import cyrillic_latin_translator
 from django.contrib.auth import get_user_model
-import math
 
 User = get_user_model()
 
@@ -77,10 +81,100 @@ class ArticleListSerializer(serializers.ModelSerializer):
         ]
 
     def get_reading_time(self, obj):
-        """Matn uzunligiga qarab taxminiy o‘qish vaqti (daqiqa)"""
-        words = obj.content.split()
-        minutes = math.ceil(len(words) / 200)  # 200 ta so‘z = 1 daqiqa
-        return f"{minutes} daqiqa"
+        """Saqlangan word_count bo‘yicha taxminiy o‘qish vaqti (daqiqa), content yuklanmaydi"""
+        return f"{obj.reading_time} daqiqa"
+
+
+class ArticleListValuesSerializer:
+    """
+    ArticleListSerializer bilan bir xil JSON, lekin model obyektlari va har bir maydon
+    uchun serializer chaqiruvisiz: `.values(*VALUES_FIELDS)` qatorlari va barcha
+    maqolalar teglari uchun bitta so'rov. Faqat o'qish uchun.
+    """
+
+    VALUES_FIELDS = (
+        "id",
+        "title",
+        "slug",
+        "excerpt",
+        "featured_image",
+        "published_at",
+        "view_count",
+        "word_count",
+        "author__username",
+        "category_id",
+        "category__name",
+        "category__slug",
+        "category__parent_id",
+    )
+
+    def __init__(self, rows, context=None):
+        self.rows = rows
+        self.context = context or {}
+        # sana ModelSerializer'dagidek formatlanishi uchun
+        self.datetime_field = serializers.DateTimeField()
+        self.image_storage = Article._meta.get_field("featured_image").storage
+
+    def get_tags(self, article_ids):
+        tags = defaultdict(list)
+        rows = (
+            Article.tags.through.objects.filter(article_id__in=article_ids)
+            .order_by("article_id", *(f"tag__{field}" for field in Tag._meta.ordering))
+            .values_list("article_id", "tag_id", "tag__name", "tag__slug")
+        )
+        for article_id, tag_id, name, slug in rows:
+            tags[article_id].append({"id": tag_id, "name": name, "slug": slug})
+        return tags
+
+    def get_featured_image(self, name):
+        if not name:
+            return None
+        if not api_settings.UPLOADED_FILES_USE_URL:
+            return name
+        url = self.image_storage.url(name)
+        request = self.context.get("request")
+        return request.build_absolute_uri(url) if request is not None else url
+
+    @property
+    def data(self):
+        tags = self.get_tags([row["id"] for row in self.rows])
+        to_datetime = self.datetime_field.to_representation
+        data = []
+        for row in self.rows:
+            article_tags = tags.get(row["id"], [])
+            category = None
+            if row["category_id"] is not None:
+                category = {
+                    "id": row["category_id"],
+                    "name": row["category__name"],
+                    "slug": row["category__slug"],
+                    "parent": row["category__parent_id"],
+                }
+            published_at = row["published_at"]
+            item = {
+                "id": row["id"],
+                "title": row["title"],
+                "slug": row["slug"],
+                "excerpt": row["excerpt"],
+                "featured_image": self.get_featured_image(row["featured_image"]),
+            }
+            # muallifi o'chirilgan maqolada ArticleListSerializer "author" kalitini chiqarmaydi
+            if row["author__username"] is not None:
+                item["author"] = row["author__username"]
+            item.update(
+                {
+                    "category": category,
+                    "tags": article_tags,
+                    "tag_list": [tag["name"] for tag in article_tags],
+                    "published_at": to_datetime(published_at)
+                    if published_at is not None
+                    else None,
+                    "view_count": row["view_count"],
+                    "reading_time": f"{math.ceil(row['word_count'] / Article.WORDS_PER_MINUTE)} daqiqa",
+                }
+            )
+            data.append(item)
+        return data
 
 
 class ArticleDetailSerializer(serializers.ModelSerializer):
@@ -120,6 +214,14 @@ class ArticleDetailSerializer(serializers.ModelSerializer):
         ]
 
     def get_reading_time(self, obj):
-        words = obj.content.split()
-        minutes = math.ceil(len(words) / 200)
-        return f"{minutes} daqiqa"
+        return f"{obj.reading_time} daqiqa"
+
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        # ?script=latin|cyrillic: saqlangan nusxalar (Article.TRANSLITERATED_FIELDS)
+        script = self.context.get("script")
+        if script:
+            index = 0 if script == cyrillic_latin_translator.LATIN else 1
+            for source, copies in Article.TRANSLITERATED_FIELDS.items():
+                data[source] = getattr(instance, copies[index]) or data[source]
+        return data
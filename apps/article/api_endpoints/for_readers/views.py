@@ -1,25 +1,64 @@
 # api_endpoints/for_readers/views.py
+import logging
+
+import redis
+from django.conf import settings
 from django.shortcuts import get_object_or_404
-from django.db.models import Count, Q, F
+from django.db.models import Count, Exists, OuterRef, Q
 from django.utils.decorators import method_decorator
 from django.views.decorators.cache import cache_page
 
 from rest_framework import generics, permissions, filters
 from rest_framework.response import Response
+from rest_framework.views import APIView
 
 from django_filters.rest_framework import DjangoFilterBackend
 
 from apps.article.models import Article, Tag, Category, Comment
+from apps.article.services.autocomplete import AutocompleteIndex
+from apps.article.services.trending import TrendingIndex
+from apps.article.services.unique_visitors import (
+    UniqueVisitorCounter,
+    visitor_fingerprint,
+)
+from apps.article.services.view_counter import ViewCounter
+from apps.common.pagination import LimitOffsetOrKeysetPagination
+from apps.text_services import cyrillic_latin_translator
+from apps.text_services.filters import MultiSymbolSearchFilter
 
 from .serializers import (
     CategorySerializer,
     ArticleListSerializer,
+    ArticleListValuesSerializer,
     ArticleDetailSerializer,
     TagSerializer,
     CommentSerializer,
 )
 from .filters import ArticleFilter
 
+logger = logging.getLogger(__name__)
+
+
+class ArticleValuesListMixin:
+    """
+    Ro'yxat javobini ArticleListValuesSerializer bilan .values() qatorlaridan quradi:
+    ArticleListSerializer bilan bir xil JSON, model obyektlari yaratilmaydi.
+    Filtrlar, qidiruv, tartib va pagination o'zgarmaydi.
+    """
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        rows = queryset.prefetch_related(None).values(
+            *ArticleListValuesSerializer.VALUES_FIELDS
+        )
+        context = self.get_serializer_context()
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(
+                ArticleListValuesSerializer(page, context).data
+            )
+        return Response(ArticleListValuesSerializer(list(rows), context).data)
+
 
 class CategoryListAPIView(generics.ListAPIView):
     """
@@ -29,11 +68,12 @@ class CategoryListAPIView(generics.ListAPIView):
     serializer_class = CategorySerializer
 
 
-class CategoryArticleListAPIView(generics.ListAPIView):
+class CategoryArticleListAPIView(ArticleValuesListMixin, generics.ListAPIView):
     """
     Bitta kategoriya uchun maqolalar ro‘yxati
     """
     serializer_class = ArticleListSerializer
+    pagination_class = LimitOffsetOrKeysetPagination
 
     def get_queryset(self):
         slug = self.kwargs.get("slug")
@@ -47,18 +87,36 @@ class CategoryArticleListAPIView(generics.ListAPIView):
             .order_by("-published_at")
         )
 
-class ArticleListAPIView(generics.ListAPIView):
+class ArticleListAPIView(ArticleValuesListMixin, generics.ListAPIView):
     """
     GET /api/articles/
     Filtirlar: ?category=<slug>&tag=<slug>&author=<username>&date_from=&date_to=
     Ordering: ?ordering=-published_at or ?ordering=view_count
-    Pagination: LimitOffsetPagination (settings orqali)
+    Search: ?search=<matn> (lotin yoki kirill; SEARCH_BACKEND ga qarab search_document
+        yoki search_vector va teg/kategoriya nomlari, yoki sarlavha/teg/kategoriya
+        nomlari bo'yicha trigram)
+    Pagination: ?limit=&offset= yoki cheksiz scroll uchun ?pagination=cursor
+        (published_at, id) bo'yicha keyset, count so'rovisiz; keyingi sahifa "next" havolasida
     """
     serializer_class = ArticleListSerializer
-    filter_backends = [DjangoFilterBackend, filters.OrderingFilter]  # search handled by your MultiSymbolSearchFilter globally
+    # qidiruv OrderingFilter'dan keyin: fulltext natijalarni search_rank bo'yicha tartiblaydi
+    filter_backends = [
+        DjangoFilterBackend,
+        filters.OrderingFilter,
+        MultiSymbolSearchFilter,
+    ]
     filterset_class = ArticleFilter
+    search_fields = (*Article.SEARCH_DOCUMENT_FIELDS, "tags__name", "category__name")
+    search_document_field = "search_document"
+    # teg va kategoriya nomlari search_document'da yo'q, ular alohida qidiriladi
+    search_document_sources = Article.SEARCH_DOCUMENT_FIELDS
+    search_vector_field = "search_vector"
+    search_trigram_fields = ("title", "tags__name", "category__name")
+    # natijalar (id ro'yxati) cache'lanadi, signals.py maqola/teg/kategoriya o'zgarganda versiyani oshiradi
+    search_cache_version_key = Article.SEARCH_CACHE_VERSION_KEY
     ordering_fields = ["published_at", "view_count", "comment_count"]
     ordering = ["-published_at"]
+    pagination_class = LimitOffsetOrKeysetPagination
 
     def get_queryset(self):
         # faqat nashr qilingan maqolalar
@@ -66,18 +124,105 @@ class ArticleListAPIView(generics.ListAPIView):
             Article.objects.filter(status=Article.Status.PUBLISHED)
             .select_related("author", "category")
             .prefetch_related("tags")
-            .annotate(
-                comment_count=Count("comments", filter=Q(comments__is_active=True))
-            )
-            .distinct()
         )
         return qs
 
 
+class ArticleAutocompleteAPIView(APIView):
+    """
+    GET /api/articles/autocomplete/?q=<prefiks>&limit=<son>
+    Yozish davomida takliflar: sarlavhasi, teg yoki kategoriya nomidagi biror so'z
+    prefiks bilan boshlanadigan nashr qilingan maqolalar, teglar va kategoriyalar.
+    Bazaga murojaat qilinmaydi, javob Redis'dagi prefiks indeksidan olinadi
+    (apps.article.services.autocomplete).
+    """
+
+    permission_classes = [permissions.AllowAny]
+    default_limit = 10
+    max_limit = 20
+
+    def get_limit(self):
+        try:
+            limit = int(self.request.query_params.get("limit", self.default_limit))
+        except ValueError:
+            return self.default_limit
+        return max(1, min(limit, self.max_limit))
+
+    def get(self, request, *args, **kwargs):
+        prefix = request.query_params.get("q", "")
+        try:
+            results = AutocompleteIndex().suggest(prefix, self.get_limit())
+        except redis.RedisError:
+            logger.warning("Autocomplete lookup failed", exc_info=True)
+            results = []
+        return Response({"results": results})
+
+
+class ArticleTrendingAPIView(APIView):
+    """
+    GET /api/articles/trending/?category=<slug>&tag=<slug>&limit=<son>
+    Hozir ommabop maqolalar: ko'rish va izohlarning vaqt o'tishi bilan so'nuvchi
+    ballari bo'yicha (apps.article.services.trending). Bitta ZREVRANGE va id lar
+    bo'yicha bitta so'rov; butun nashr qilingan to'plam saralanmaydi. Redis
+    ishlamasa view_count bo'yicha tartiblanadi.
+    """
+
+    permission_classes = [permissions.AllowAny]
+    default_limit = 10
+    max_limit = 50
+
+    def get_limit(self):
+        try:
+            limit = int(self.request.query_params.get("limit", self.default_limit))
+        except ValueError:
+            return self.default_limit
+        return max(1, min(limit, self.max_limit))
+
+    def get_queryset(self):
+        queryset = Article.objects.filter(status=Article.Status.PUBLISHED)
+        category = self.request.query_params.get("category")
+        tag = self.request.query_params.get("tag")
+        if category:
+            queryset = queryset.filter(category__slug=category)
+        elif tag:
+            queryset = queryset.filter(
+                Exists(
+                    Article.tags.through.objects.filter(
+                        article=OuterRef("pk"), tag__slug=tag
+                    )
+                )
+            )
+        return queryset.values(*ArticleListValuesSerializer.VALUES_FIELDS)
+
+    def get(self, request, *args, **kwargs):
+        limit = self.get_limit()
+        rows = self.get_queryset()
+        try:
+            article_ids = TrendingIndex().top(
+                limit,
+                category_slug=request.query_params.get("category"),
+                tag_slug=request.query_params.get("tag"),
+            )
+        except redis.RedisError:
+            logger.warning("Trending lookup failed", exc_info=True)
+            rows = list(rows.order_by("-view_count", "-pk")[:limit])
+        else:
+            # nashrdan olingan yoki kategoriyasi/tegi o'zgargan maqolalar tushib qoladi
+            by_id = {row["id"]: row for row in rows.filter(pk__in=article_ids)}
+            rows = [by_id[pk] for pk in article_ids if pk in by_id]
+        context = {"request": request, "view": self}
+        return Response({"results": ArticleListValuesSerializer(rows, context).data})
+
+
 class ArticleDetailAPIView(generics.RetrieveAPIView):
     """
-    GET /api/articles/<slug>/
-    Maqola detail qaytaradi va view_count ni atomik ravishda oshiradi.
+    GET /api/articles/<slug>/?script=latin|cyrillic
+    Maqola detail qaytaradi (script berilsa sarlavha, anons va matn shu yozuvda). Ko'rish Redis'ga yoziladi (ViewCounter), bazaga esa
+    flush_article_views vazifasi yozadi; javobdagi view_count = bazadagi qiymat +
+    hali yozilmagan ko'rishlar. ARTICLE_VIEWS_BUFFERED o'chirilgan bo'lsa yoki Redis
+    ishlamasa, view_count bazada oshiriladi (increment_view_count).
+    Noyob tashrif buyuruvchilar UniqueVisitorCounter (HyperLogLog) da, ko'rish
+    trending reytingiga TrendingIndex da qo'shiladi.
     """
     serializer_class = ArticleDetailSerializer
     lookup_field = "slug"
@@ -86,24 +231,81 @@ class ArticleDetailAPIView(generics.RetrieveAPIView):
     # (ixtiyoriy) bu endpointni cache qilish mumkin — kerak bo'lsa uncomment qiling:
     # @method_decorator(cache_page(60 * 5), name="dispatch")
     def get_queryset(self):
+        # lotin/kirill nusxalaridan faqat ?script= so'raganlari yuklanadi
+        script = self.get_script()
+        loaded = (
+            {
+                latin if script == cyrillic_latin_translator.LATIN else cyrillic
+                for latin, cyrillic in Article.TRANSLITERATED_FIELDS.values()
+            }
+            if script
+            else set()
+        )
         return (
             Article.objects.filter(status=Article.Status.PUBLISHED)
             .select_related("author", "category")
             .prefetch_related("tags", "comments__author")
-            .annotate(
-                comment_count=Count("comments", filter=Q(comments__is_active=True))
+            .defer(
+                *(
+                    field
+                    for field in Article.TRANSLITERATED_COPY_FIELDS
+                    if field not in loaded
+                ),
+                *Article.SEARCH_COLUMNS,
             )
         )
 
+    def get_script(self):
+        script = self.request.query_params.get("script")
+        if script in (
+            cyrillic_latin_translator.LATIN,
+            cyrillic_latin_translator.CYRILLIC,
+        ):
+            return script
+        return None
+
+    def get_serializer_context(self):
+        return {**super().get_serializer_context(), "script": self.get_script()}
+
     def retrieve(self, request, *args, **kwargs):
         instance = self.get_object()
-        # atomic increment
-        Article.objects.filter(pk=instance.pk).update(view_count=F("view_count") + 1)
-        # yangilangan view_count ni olish
-        instance.refresh_from_db(fields=["view_count"])
+        self.count_visitor(instance)
+        self.count_trending(instance)
+        if settings.ARTICLE_VIEWS_BUFFERED:
+            try:
+                instance.view_count += ViewCounter().incr(instance.pk)
+                return Response(self.get_serializer(instance).data)
+            except redis.RedisError:
+                logger.warning(
+                    "View counter unavailable, updating the database", exc_info=True
+                )
+        # atomik oshirish va yangi qiymatni o'qish bitta so'rovda (PostgreSQL, SQLite)
+        view_count = Article.objects.increment_view_count(instance.pk)
+        if view_count is not None:
+            instance.view_count = view_count
         serializer = self.get_serializer(instance)
         return Response(serializer.data)
 
+    def count_trending(self, instance):
+        if not settings.ARTICLE_TRENDING:
+            return
+        try:
+            TrendingIndex().add_view(
+                instance.pk,
+                instance.category.slug if instance.category else None,
+                [tag.slug for tag in instance.tags.all()],
+            )
+        except redis.RedisError:
+            logger.warning("Trending index unavailable", exc_info=True)
+
+    def count_visitor(self, instance):
+        if not settings.ARTICLE_UNIQUE_VISITORS:
+            return
+        try:
+            UniqueVisitorCounter().add(instance.pk, visitor_fingerprint(self.request))
+        except redis.RedisError:
+            logger.warning("Unique visitor counter unavailable", exc_info=True)
+
 
 class TagListAPIView(generics.ListAPIView):
     """
@@ -116,7 +318,7 @@ class TagListAPIView(generics.ListAPIView):
     )
 
 
-class ArticlesByTagAPIView(generics.ListAPIView):
+class ArticlesByTagAPIView(ArticleValuesListMixin, generics.ListAPIView):
     """
     GET /api/tags/<slug>/articles/  -> berilgan tegga tegishli nashr qilingan maqolalar
     """
@@ -124,21 +326,25 @@ class ArticlesByTagAPIView(generics.ListAPIView):
     filter_backends = [filters.OrderingFilter]
     ordering = ["-published_at"]
     permission_classes = [permissions.AllowAny]
+    pagination_class = LimitOffsetOrKeysetPagination
 
     def get_queryset(self):
         slug = self.kwargs.get("slug")
         return (
-            Article.objects.filter(status=Article.Status.PUBLISHED, tags__slug__iexact=slug)
+            Article.objects.filter(
+                Exists(
+                    Article.tags.through.objects.filter(
+                        article=OuterRef("pk"), tag__slug__iexact=slug
+                    )
+                ),
+                status=Article.Status.PUBLISHED,
+            )
             .select_related("author", "category")
             .prefetch_related("tags")
-            .annotate(
-                comment_count=Count("comments", filter=Q(comments__is_active=True))
-            )
-            .distinct()
         )
 
 
-class ArticlesByCategoryAPIView(generics.ListAPIView):
+class ArticlesByCategoryAPIView(ArticleValuesListMixin, generics.ListAPIView):
     """
     GET /api/categories/<slug>/articles/  -> berilgan kategoriya bo'yicha nashr qilingan maqolalar
     """
@@ -146,6 +352,7 @@ class ArticlesByCategoryAPIView(generics.ListAPIView):
     filter_backends = [filters.OrderingFilter]
     ordering = ["-published_at"]
     permission_classes = [permissions.AllowAny]
+    pagination_class = LimitOffsetOrKeysetPagination
 
     def get_queryset(self):
         slug = self.kwargs.get("slug")
@@ -153,10 +360,6 @@ class ArticlesByCategoryAPIView(generics.ListAPIView):
             Article.objects.filter(status=Article.Status.PUBLISHED, category__slug__iexact=slug)
             .select_related("author", "category")
             .prefetch_related("tags")
-            .annotate(
-                comment_count=Count("comments", filter=Q(comments__is_active=True))
-            )
-            .distinct()
         )
 
 
@@ -186,6 +389,8 @@ __all__ = [
     "CategoryListAPIView",
     "CategoryArticleListAPIView",
     "ArticleListAPIView",
+    "ArticleAutocompleteAPIView",
+    "ArticleTrendingAPIView",
     "ArticleDetailAPIView",
     "TagListAPIView",
     "ArticlesByTagAPIView",
@@ -0,0 +1,45 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.article.models import Article
+
+
+class Command(BaseCommand):
+    help = (
+        "Mavjud maqolalarning word_count maydonini content dan hisoblaydi. Maqolalar pk "
+        "bo'yicha partiyalab o'qiladi va faqat o'zgarganlari bulk_update orqali yoziladi."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        started = time.monotonic()
+        last_pk = 0
+        total = updated = 0
+        while True:
+            rows = list(
+                Article.objects.filter(pk__gt=last_pk)
+                .order_by("pk")
+                .values_list("pk", "content", "word_count")[:batch_size]
+            )
+            if not rows:
+                break
+            changed = []
+            for pk, content, word_count in rows:
+                counted = len(content.split())
+                if counted != word_count:
+                    changed.append(Article(pk=pk, word_count=counted))
+            Article.objects.bulk_update(changed, ["word_count"])
+            last_pk = rows[-1][0]
+            total += len(rows)
+            updated += len(changed)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{total} ta maqola tekshirildi, {updated} tasi yangilandi "
+                f"({time.monotonic() - started:.1f}s)"
+            )
+        )
@@ -0,0 +1,22 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.article.models import Article
+
+
+class Command(BaseCommand):
+    help = (
+        "Article.comment_count ni faol izohlar sonidan qayta hisoblaydi va farq qilgan "
+        "maqolalarni tuzatadi (signal yubormaydigan bulk o'zgarishlardan keyin)."
+    )
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        repaired = Article.objects.reconcile_comment_count()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{repaired} ta maqolaning comment_count i tuzatildi "
+                f"({time.monotonic() - started:.1f}s)"
+            )
+        )
@@ -0,0 +1,105 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from django.core.management.base import BaseCommand
+
+from apps.article.models import Article
+
+
+def transliterate_row(row):
+    """(pk, title, excerpt, content) -> (pk, {maydon: qiymat}). Process pool ichida ishlaydi."""
+    pk, *values = row
+    article = Article(pk=pk, **dict(zip(Article.TRANSLITERATED_FIELDS, values)))
+    article.transliterate()
+    result = {
+        field: getattr(article, field) for field in Article.TRANSLITERATED_COPY_FIELDS
+    }
+    result["search_document"] = article.build_search_document()
+    return pk, result
+
+
+class Command(BaseCommand):
+    help = (
+        "Barcha maqolalarning title, excerpt va content maydonlarini lotin va kirill "
+        "yozuviga o'giradi. Maqolalar pk bo'yicha partiyalab o'qiladi, process pool'da "
+        "o'giriladi va search_document bilan birga bulk_update orqali yoziladi. To'xtatilsa, checkpoint faylidan davom etadi."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+        parser.add_argument("--batch-size", type=int, default=200)
+        parser.add_argument(
+            "--checkpoint",
+            default=".transliterate_articles.checkpoint",
+            help="Oxirgi yozilgan maqola pk'si saqlanadigan fayl.",
+        )
+        parser.add_argument(
+            "--restart",
+            action="store_true",
+            help="Checkpoint'ni e'tiborsiz qoldirib, boshidan boshlash.",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        checkpoint = options["checkpoint"]
+        last_pk = 0 if options["restart"] else self.read_checkpoint(checkpoint)
+        if last_pk:
+            self.stdout.write(f"pk > {last_pk} dan davom etilmoqda")
+
+        source_fields = list(Article.TRANSLITERATED_FIELDS)
+        target_fields = [*Article.TRANSLITERATED_COPY_FIELDS, "search_document"]
+
+        total = 0
+        started = time.monotonic()
+        # pool bazaga ulanishdan oldin yaratiladi, ishchilar faqat matn bilan ishlaydi
+        with ProcessPoolExecutor(max_workers=options["workers"]) as pool:
+            while True:
+                rows = list(
+                    Article.objects.filter(pk__gt=last_pk)
+                    .order_by("pk")
+                    .values_list("pk", *source_fields)[:batch_size]
+                )
+                if not rows:
+                    break
+
+                articles = [
+                    Article(pk=pk, **values)
+                    for pk, values in pool.map(
+                        transliterate_row,
+                        rows,
+                        chunksize=max(1, len(rows) // (options["workers"] * 4)),
+                    )
+                ]
+                Article.objects.bulk_update(articles, target_fields)
+                Article.objects.filter(
+                    pk__in=[article.pk for article in articles]
+                ).update_search_vector()
+
+                last_pk = rows[-1][0]
+                self.write_checkpoint(checkpoint, last_pk)
+                total += len(rows)
+                elapsed = time.monotonic() - started
+                self.stdout.write(
+                    f"{total} ta maqola, oxirgi pk={last_pk}, "
+                    f"{total / elapsed:.1f} qator/s"
+                )
+
+        if os.path.exists(checkpoint):
+            os.remove(checkpoint)
+        self.stdout.write(self.style.SUCCESS(f"Tayyor: {total} ta maqola o'girildi"))
+
+    @staticmethod
+    def read_checkpoint(path):
+        try:
+            with open(path) as file:
+                return int(file.read().strip() or 0)
+        except FileNotFoundError:
+            return 0
+
+    @staticmethod
+    def write_checkpoint(path, pk):
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as file:
+            file.write(str(pk))
+        os.replace(tmp_path, path)
@@ -0,0 +1,55 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("article", "0002_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="article",
+            name="content_cyrillic",
+            field=models.TextField(
+                blank=True, editable=False, verbose_name="Asosiy matn (kirill)"
+            ),
+        ),
+        migrations.AddField(
+            model_name="article",
+            name="content_latin",
+            field=models.TextField(
+                blank=True, editable=False, verbose_name="Asosiy matn (lotin)"
+            ),
+        ),
+        migrations.AddField(
+            model_name="article",
+            name="excerpt_cyrillic",
+            field=models.TextField(
+                blank=True, editable=False, verbose_name="Qisqa tavsif (kirill)"
+            ),
+        ),
+        migrations.AddField(
+            model_name="article",
+            name="excerpt_latin",
+            field=models.TextField(
+                blank=True, editable=False, verbose_name="Qisqa tavsif (lotin)"
+            ),
+        ),
+        migrations.AddField(
+            model_name="article",
+            name="title_cyrillic",
+            field=models.TextField(
+                blank=True, editable=False, verbose_name="Sarlavha (kirill)"
+            ),
+        ),
+        migrations.AddField(
+            model_name="article",
+            name="title_latin",
+            field=models.TextField(
+                blank=True, editable=False, verbose_name="Sarlavha (lotin)"
+            ),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-18 17:01
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import TrigramExtension
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("article", "0003_article_transliterated_fields"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddField(
+            model_name="article",
+            name="search_document",
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name="article",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["search_document"],
+                name="article_search_document_trgm",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 5.2.18 on 2026-10-18 17:03
+
+import apps.common.indexes
+import apps.text_services.expressions
+import django.contrib.postgres.indexes
+from django.conf import settings
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("article", "0005_article_search_vector"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="article",
+            index=apps.common.indexes.OpClassGinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    apps.text_services.expressions.StripApostrophes("title"),
+                    name="gin_trgm_ops",
+                ),
+                name="article_title_trgm",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="category",
+            index=apps.common.indexes.OpClassGinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    apps.text_services.expressions.StripApostrophes("name"),
+                    name="gin_trgm_ops",
+                ),
+                name="category_name_trgm",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="tag",
+            index=apps.common.indexes.OpClassGinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    apps.text_services.expressions.StripApostrophes("name"),
+                    name="gin_trgm_ops",
+                ),
+                name="tag_name_trgm",
+            ),
+        ),
+    ]
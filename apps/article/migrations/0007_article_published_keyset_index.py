@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-18 17:09
+
+import apps.common.indexes
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("article", "0006_trigram_indexes"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="article",
+            index=apps.common.indexes.NullsOrderIndex(
+                models.OrderBy(
+                    models.F("published_at"), descending=True, nulls_last=True
+                ),
+                models.OrderBy(models.F("id"), descending=True),
+                condition=models.Q(("status", "PUBLISHED")),
+                name="article_published_keyset",
+            ),
+        ),
+    ]
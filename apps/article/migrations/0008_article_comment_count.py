@@ -0,0 +1,51 @@
+# Generated by Django 5.2.18 on 2026-10-18 17:11
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models.functions import Coalesce
+
+
+def fill_comment_count(apps, schema_editor):
+    Article = apps.get_model("article", "Article")
+    Comment = apps.get_model("article", "Comment")
+    active_comments = (
+        Comment.objects.filter(article=models.OuterRef("pk"), is_active=True)
+        .order_by()
+        .values("article")
+        .annotate(count=models.Count("pk"))
+        .values("count")
+    )
+    Article.objects.update(
+        comment_count=Coalesce(
+            models.Subquery(active_comments),
+            0,
+            output_field=models.PositiveIntegerField(),
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("article", "0007_article_published_keyset_index"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="article",
+            name="comment_count",
+            field=models.PositiveIntegerField(
+                default=0, editable=False, verbose_name="Izohlar soni"
+            ),
+        ),
+        migrations.RunPython(fill_comment_count, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="article",
+            index=models.Index(
+                condition=models.Q(("status", "PUBLISHED")),
+                fields=["-comment_count"],
+                name="article_comment_count",
+            ),
+        ),
+    ]
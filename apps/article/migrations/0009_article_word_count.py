@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-18 17:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("article", "0008_article_comment_count"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="article",
+            name="word_count",
+            field=models.PositiveIntegerField(
+                default=0, editable=False, verbose_name="So'zlar soni"
+            ),
+        ),
+    ]
@@ -0,0 +1,61 @@
+# Generated by Django 5.2.18 on 2026-10-18 17:18
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("article", "0009_article_word_count"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="article",
+            name="unique_visitors",
+            field=models.PositiveIntegerField(
+                default=0, editable=False, verbose_name="Noyob tashrif buyuruvchilar"
+            ),
+        ),
+        migrations.CreateModel(
+            name="ArticleVisitorStat",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("date", models.DateField(verbose_name="Sana")),
+                (
+                    "visitors",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="Noyob tashrif buyuruvchilar"
+                    ),
+                ),
+                (
+                    "article",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="visitor_stats",
+                        to="article.article",
+                        verbose_name="Maqola",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Tashrif statistikasi",
+                "verbose_name_plural": "Tashrif statistikasi",
+                "ordering": ["-date"],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("article", "date"), name="article_visitor_stat_unique"
+                    )
+                ],
+            },
+        ),
+    ]
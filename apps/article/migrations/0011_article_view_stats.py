@@ -0,0 +1,99 @@
+# Generated by Django 5.2.18 on 2026-10-18 17:25
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("article", "0010_article_visitor_stats"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ArticleDailyViewStat",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("date", models.DateField(verbose_name="Sana")),
+                (
+                    "views",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="Ko'rishlar soni"
+                    ),
+                ),
+                (
+                    "article",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="daily_view_stats",
+                        to="article.article",
+                        verbose_name="Maqola",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Kunlik ko'rishlar",
+                "verbose_name_plural": "Kunlik ko'rishlar",
+                "ordering": ["-date"],
+                "indexes": [
+                    models.Index(fields=["date"], name="article_daily_view_stat_prune")
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("article", "date"),
+                        name="article_daily_view_stat_unique",
+                    )
+                ],
+            },
+        ),
+        migrations.CreateModel(
+            name="ArticleViewStat",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("hour", models.DateTimeField(verbose_name="Soat")),
+                (
+                    "views",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="Ko'rishlar soni"
+                    ),
+                ),
+                (
+                    "article",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="view_stats",
+                        to="article.article",
+                        verbose_name="Maqola",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Soatlik ko'rishlar",
+                "verbose_name_plural": "Soatlik ko'rishlar",
+                "ordering": ["-hour"],
+                "indexes": [
+                    models.Index(
+                        fields=["article", "hour"], name="article_view_stat_hour"
+                    ),
+                    models.Index(fields=["hour"], name="article_view_stat_prune"),
+                ],
+            },
+        ),
+    ]
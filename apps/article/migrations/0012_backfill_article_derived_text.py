@@ -0,0 +1,89 @@
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations, models
+
+from apps.text_services import cyrillic_latin_translator
+
+BATCH_SIZE = 200
+
+# Article.TRANSLITERATED_FIELDS / SEARCH_DOCUMENT_FIELDS shu migratsiya paytidagi holati
+TRANSLITERATED_FIELDS = {
+    "title": ("title_latin", "title_cyrillic"),
+    "excerpt": ("excerpt_latin", "excerpt_cyrillic"),
+    "content": ("content_latin", "content_cyrillic"),
+}
+SEARCH_DOCUMENT_FIELDS = ("title", "excerpt", "content")
+
+
+def derived_values(title, excerpt, content):
+    """Article.save() hisoblaydigan qiymatlar: nusxalar, search_document, word_count."""
+    sources = {"title": title, "excerpt": excerpt or "", "content": content or ""}
+    values = {}
+    for source, (latin_field, cyrillic_field) in TRANSLITERATED_FIELDS.items():
+        values[latin_field] = cyrillic_latin_translator.transliterate(
+            sources[source], cyrillic_latin_translator.LATIN
+        )
+        values[cyrillic_field] = cyrillic_latin_translator.transliterate(
+            sources[source], cyrillic_latin_translator.CYRILLIC
+        )
+    parts = [
+        cyrillic_latin_translator.normalize_latin(values[TRANSLITERATED_FIELDS[field][0]])
+        for field in SEARCH_DOCUMENT_FIELDS
+    ]
+    parts[0] = parts[0].replace("\n", " ")
+    values["search_document"] = "\n".join(parts)
+    values["word_count"] = len(sources["content"].split())
+    return values
+
+
+def fill_derived_text(apps, schema_editor):
+    """
+    0003, 0004 va 0009 qo'shgan ustunlarni mavjud maqolalar uchun to'ldiradi
+    (bo'sh qolsa qidiruv ularni topmaydi, o'qish vaqti 0 bo'ladi).
+    """
+    Article = apps.get_model("article", "Article")
+    database = schema_editor.connection.alias
+    articles = Article.objects.using(database)
+    is_postgresql = schema_editor.connection.vendor == "postgresql"
+    target_fields = [
+        *(field for pair in TRANSLITERATED_FIELDS.values() for field in pair),
+        "search_document",
+        "word_count",
+    ]
+    last_pk = 0
+    while True:
+        rows = list(
+            articles.filter(pk__gt=last_pk)
+            .order_by("pk")
+            .values_list("pk", "title", "excerpt", "content")[:BATCH_SIZE]
+        )
+        if not rows:
+            break
+        articles.bulk_update(
+            [Article(pk=row[0], **derived_values(*row[1:])) for row in rows],
+            target_fields,
+        )
+        if is_postgresql:
+            # ArticleQuerySet.update_search_vector bilan bir xil
+            title = models.Func(
+                models.F("search_document"), models.Value("\n"), models.Value(1),
+                function="split_part",
+                output_field=models.TextField(),
+            )
+            articles.filter(pk__in=[row[0] for row in rows]).update(
+                search_vector=(
+                    SearchVector(title, weight="A", config="simple")
+                    + SearchVector("search_document", weight="B", config="simple")
+                )
+            )
+        last_pk = rows[-1][0]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("article", "0011_article_view_stats"),
+    ]
+
+    operations = [
+        migrations.RunPython(fill_derived_text, migrations.RunPython.noop),
+    ]
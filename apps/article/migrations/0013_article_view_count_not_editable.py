@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("article", "0012_backfill_article_derived_text"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="article",
+            name="view_count",
+            field=models.PositiveIntegerField(
+                default=0, editable=False, verbose_name="Ko'rishlar soni"
+            ),
+        ),
+    ]
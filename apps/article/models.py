@@ -1,7 +1,16 @@
-from django.db import models
+import math
+
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.search import SearchVector, SearchVectorField
+from django.db import DatabaseError, connections, models, router, transaction
+from django.db.models.functions import Coalesce
 from django.utils.text import slugify
 from django.contrib.auth import get_user_model
 
+from apps.common.indexes import NullsOrderIndex, OpClassGinIndex
+from apps.text_services import cyrillic_latin_translator
+from apps.text_services.expressions import StripApostrophes
+
 User = get_user_model()
 # Kategoriya modeli
 class Category(models.Model):
@@ -23,6 +32,13 @@ class Category(models.Model):
         verbose_name = "Kategoriya"
         verbose_name_plural = "Kategoriyalar"
         ordering = ['name']
+        indexes = [
+            # trigram qidiruv uchun (MultiSymbolSearchFilter, "trigram")
+            OpClassGinIndex(
+                OpClass(StripApostrophes("name"), name="gin_trgm_ops"),
+                name="category_name_trgm",
+            ),
+        ]
 
     def __str__(self):
         return self.name
@@ -39,11 +55,86 @@ class Tag(models.Model):
         verbose_name = "Teg"
         verbose_name_plural = "Teglar"
         ordering = ['name']
+        indexes = [
+            # trigram qidiruv uchun (MultiSymbolSearchFilter, "trigram")
+            OpClassGinIndex(
+                OpClass(StripApostrophes("name"), name="gin_trgm_ops"),
+                name="tag_name_trgm",
+            ),
+        ]
 
     def __str__(self):
         return self.name
 
 
+class ArticleQuerySet(models.QuerySet):
+    def update_search_vector(self):
+        """
+        search_vector ni search_document dan qayta hisoblaydi (faqat PostgreSQL).
+        Sarlavha (search_document ning birinchi qatori) A, qolgan matn B vazn oladi.
+        """
+        if connections[self.db].vendor != "postgresql":
+            return 0
+        title = models.Func(
+            models.F("search_document"),
+            models.Value("\n"),
+            models.Value(1),
+            function="split_part",
+            output_field=models.TextField(),
+        )
+        return self.update(
+            search_vector=(
+                SearchVector(title, weight="A", config="simple")
+                + SearchVector("search_document", weight="B", config="simple")
+            )
+        )
+
+    def increment_view_count(self, pk):
+        """
+        view_count ni atomik oshiradi va yangi qiymatni qaytaradi (maqola topilmasa None).
+        PostgreSQL va SQLite (3.35+) da bitta UPDATE ... RETURNING, boshqa bazalarda
+        UPDATE va SELECT.
+        """
+        connection = connections[self.db]
+        if (
+            connection.vendor in ("postgresql", "sqlite")
+            and connection.features.can_return_columns_from_insert
+        ):
+            quote_name = connection.ops.quote_name
+            table = quote_name(self.model._meta.db_table)
+            pk_column = quote_name(self.model._meta.pk.column)
+            column = quote_name(self.model._meta.get_field("view_count").column)
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f"UPDATE {table} SET {column} = {column} + 1 WHERE {pk_column} = %s RETURNING {column}",
+                    [pk],
+                )
+                row = cursor.fetchone()
+            return row[0] if row else None
+        if not self.filter(pk=pk).update(view_count=models.F("view_count") + 1):
+            return None
+        return self.filter(pk=pk).values_list("view_count", flat=True).first()
+
+    def reconcile_comment_count(self):
+        """
+        comment_count ni faol izohlar sonidan qayta hisoblaydi, faqat farq qilgan
+        qatorlar yangilanadi. Yangilangan maqolalar sonini qaytaradi.
+        """
+        active_comments = (
+            Comment.objects.filter(article=models.OuterRef("pk"), is_active=True)
+            .order_by()
+            .values("article")
+            .annotate(count=models.Count("pk"))
+            .values("count")
+        )
+        actual = Coalesce(
+            models.Subquery(active_comments),
+            0,
+            output_field=models.PositiveIntegerField(),
+        )
+        return self.exclude(comment_count=actual).update(comment_count=actual)
+
+
 class Article(models.Model):
     """
     Yangiliklar va maqolalar uchun asosiy model.
@@ -60,6 +151,35 @@ class Article(models.Model):
     featured_image = models.ImageField(upload_to='articles/%Y/%m/%d/', verbose_name="Asosiy rasm")
     
     def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+        # matn maydonlaridan hosil qilinadiganlar faqat matn yozilganda qayta hisoblanadi
+        text_changed = update_fields is None or bool(
+            set(update_fields) & set(self.TRANSLITERATED_FIELDS)
+        )
+        if text_changed:
+            self.transliterate()
+            self.search_document = self.build_search_document()
+            self.word_count = len(self.content.split())
+        implicit_update_fields = update_fields is None and not self._state.adding
+        if update_fields is not None and text_changed:
+            kwargs["update_fields"] = {
+                *update_fields,
+                *self.TRANSLITERATED_COPY_FIELDS,
+                "search_document",
+                "word_count",
+            }
+        elif implicit_update_fields:
+            # view_count, comment_count va unique_visitors ni faqat ViewCounter,
+            # signallar va rollup yangilaydi, eskirgan qiymati qayta yozilmasin;
+            # yuklanmagan (defer) maydonlar ham Django'dagidek yozilmaydi
+            deferred_fields = self.get_deferred_fields()
+            kwargs["update_fields"] = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key
+                and field.name not in self.COUNTER_FIELDS
+                and field.attname not in deferred_fields
+            ]
         if not self.slug:
             base_slug = slugify(self.title)
             slug = base_slug
@@ -68,7 +188,32 @@ class Article(models.Model):
                 slug = f"{base_slug}-{num}"
                 num += 1
             self.slug = slug
-        super().save(*args, **kwargs)
+        if not implicit_update_fields or kwargs.get("force_update"):
+            super().save(*args, **kwargs)
+        else:
+            self._save_or_reinsert(*args, **kwargs)
+        if text_changed:
+            Article.objects.filter(pk=self.pk).update_search_vector()
+
+    def _save_or_reinsert(self, *args, **kwargs):
+        """
+        update_fields bilan saqlaydi; Django bunda qator topilmasa xato beradi,
+        oddiy save() esa INSERT qiladi. Shu orada o'chirilgan maqola ham oddiy
+        save() dagidek qayta yoziladi. Xato tashqi tranzaksiyani buzmasligi
+        uchun savepoint ichida.
+        """
+        database = kwargs.get("using") or router.db_for_write(Article, instance=self)
+        try:
+            with transaction.atomic(using=database):
+                super().save(*args, **kwargs)
+        except DatabaseError:
+            if (
+                self.get_deferred_fields()
+                or Article._base_manager.using(database).filter(pk=self.pk).exists()
+            ):
+                raise
+            del kwargs["update_fields"]
+            super().save(*args, force_insert=True, **kwargs)
 
     # Bog'liqliklar (Relationships)
     author = models.ForeignKey(
@@ -94,19 +239,239 @@ class Article(models.Model):
     
     # Holat va statistika
     status = models.CharField(max_length=20, choices=Status.choices, default=Status.DRAFT, db_index=True)
-    view_count = models.PositiveIntegerField(default=0, verbose_name="Ko'rishlar soni")
+    # ViewCounter / increment_view_count yangilaydi, save() yozmaydi (COUNTER_FIELDS)
+    view_count = models.PositiveIntegerField(
+        default=0, editable=False, verbose_name="Ko'rishlar soni"
+    )
+    # faol izohlar soni; Comment signallari atomik yangilaydi, reconcile_comment_counts tuzatadi
+    comment_count = models.PositiveIntegerField(
+        default=0, editable=False, verbose_name="Izohlar soni"
+    )
+    # content dagi so'zlar soni, save() hisoblaydi (backfill_word_count)
+    word_count = models.PositiveIntegerField(
+        default=0, editable=False, verbose_name="So'zlar soni"
+    )
+    # noyob tashrif buyuruvchilar (HyperLogLog taxmini), rollup_article_visitors yozadi
+    unique_visitors = models.PositiveIntegerField(
+        default=0, editable=False, verbose_name="Noyob tashrif buyuruvchilar"
+    )
     
     # Vaqtlar
     published_at = models.DateTimeField(null=True, blank=True, db_index=True, verbose_name="Nashr qilingan sana")
 
+    # Lotin va kirill nusxalari: save() yangilaydi, mavjud maqolalarni transliterate_articles
+    # komandasi to'ldiradi. Detail ?script=latin|cyrillic bilan shulardan beriladi.
+    title_latin = models.TextField(
+        blank=True, editable=False, verbose_name="Sarlavha (lotin)"
+    )
+    title_cyrillic = models.TextField(
+        blank=True, editable=False, verbose_name="Sarlavha (kirill)"
+    )
+    excerpt_latin = models.TextField(
+        blank=True, editable=False, verbose_name="Qisqa tavsif (lotin)"
+    )
+    excerpt_cyrillic = models.TextField(
+        blank=True, editable=False, verbose_name="Qisqa tavsif (kirill)"
+    )
+    content_latin = models.TextField(
+        blank=True, editable=False, verbose_name="Asosiy matn (lotin)"
+    )
+    content_cyrillic = models.TextField(
+        blank=True, editable=False, verbose_name="Asosiy matn (kirill)"
+    )
+
+    # Qidiruv uchun: SEARCH_DOCUMENT_FIELDS ning lotinga o'girilgan, kichik harfli
+    # nusxasi (cyrillic_latin_translator.fold). save() va bulk yo'llarda yangilanadi.
+    search_document = models.TextField(blank=True, editable=False)
+    # search_document ning tsvector'i, ArticleQuerySet.update_search_vector to'ldiradi
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    objects = ArticleQuerySet.as_manager()
+
+    # lotin va kirill nusxalari: manba -> (lotin, kirill)
+    TRANSLITERATED_FIELDS = {
+        "title": ("title_latin", "title_cyrillic"),
+        "excerpt": ("excerpt_latin", "excerpt_cyrillic"),
+        "content": ("content_latin", "content_cyrillic"),
+    }
+    TRANSLITERATED_COPY_FIELDS = tuple(
+        field for pair in TRANSLITERATED_FIELDS.values() for field in pair
+    )
+    # detail so'rovlarida kerak bo'lmaganda yuklanmaydigan ustunlar
+    SEARCH_COLUMNS = ("search_document", "search_vector")
+
+    SEARCH_DOCUMENT_FIELDS = ("title", "excerpt", "content")
+    # save() qayta yozmaydigan, bazada alohida yangilanadigan hisoblagichlar
+    COUNTER_FIELDS = ("view_count", "comment_count", "unique_visitors")
+    # MultiSymbolSearchFilter natijalari cache'ining versiya kaliti
+    SEARCH_CACHE_VERSION_KEY = "article"
+    # o'qish vaqti uchun: 200 ta so'z = 1 daqiqa
+    WORDS_PER_MINUTE = 200
+
     class Meta:
         ordering = ['-published_at'] # Eng yangi maqolalar tepad turadi
         verbose_name = "Maqola"
         verbose_name_plural = "Maqolalar"
+        indexes = [
+            # search_document__contains (LIKE '%...%') uchun
+            GinIndex(
+                fields=["search_document"],
+                name="article_search_document_trgm",
+                opclasses=["gin_trgm_ops"],
+            ),
+            GinIndex(fields=["search_vector"], name="article_search_vector"),
+            # trigram qidiruv uchun (MultiSymbolSearchFilter, "trigram")
+            OpClassGinIndex(
+                OpClass(StripApostrophes("title"), name="gin_trgm_ops"),
+                name="article_title_trgm",
+            ),
+            # ?ordering=-comment_count uchun
+            models.Index(
+                fields=["-comment_count"],
+                name="article_comment_count",
+                condition=models.Q(status="PUBLISHED"),
+            ),
+            # ommaviy ro'yxatlarning keyset pagination'i uchun (LimitOffsetOrKeysetPagination)
+            NullsOrderIndex(
+                models.F("published_at").desc(nulls_last=True),
+                models.F("id").desc(),
+                name="article_published_keyset",
+                condition=models.Q(status="PUBLISHED"),
+            ),
+        ]
 
     def __str__(self):
         return self.title
-    
+
+    @property
+    def reading_time(self):
+        """Matn uzunligiga qarab taxminiy o'qish vaqti (daqiqa)"""
+        return math.ceil(self.word_count / self.WORDS_PER_MINUTE)
+
+    def transliterate(self):
+        """TRANSLITERATED_FIELDS dagi lotin va kirill nusxalarini manba maydonlardan yangilaydi."""
+        for source, (latin_field, cyrillic_field) in self.TRANSLITERATED_FIELDS.items():
+            value = getattr(self, source) or ""
+            setattr(
+                self,
+                latin_field,
+                cyrillic_latin_translator.transliterate(
+                    value, cyrillic_latin_translator.LATIN
+                ),
+            )
+            setattr(
+                self,
+                cyrillic_field,
+                cyrillic_latin_translator.transliterate(
+                    value, cyrillic_latin_translator.CYRILLIC
+                ),
+            )
+
+    def build_search_document(self):
+        """search_document qiymati; lotin nusxalaridan quriladi (avval transliterate())."""
+        parts = [
+            cyrillic_latin_translator.normalize_latin(
+                getattr(self, self.TRANSLITERATED_FIELDS[field][0]) or ""
+            )
+            for field in self.SEARCH_DOCUMENT_FIELDS
+        ]
+        # birinchi qator doim sarlavha bo'lishi kerak (update_search_vector)
+        parts[0] = parts[0].replace("\n", " ")
+        return "\n".join(parts)
+
+
+class ArticleVisitorStat(models.Model):
+    """
+    Maqolaning bir kundagi noyob tashrif buyuruvchilari (HyperLogLog taxmini).
+    rollup_article_visitors Celery vazifasi Redis'dan yozadi.
+    """
+
+    article = models.ForeignKey(
+        Article,
+        on_delete=models.CASCADE,
+        related_name="visitor_stats",
+        verbose_name="Maqola",
+    )
+    date = models.DateField(verbose_name="Sana")
+    visitors = models.PositiveIntegerField(
+        default=0, verbose_name="Noyob tashrif buyuruvchilar"
+    )
+
+    class Meta:
+        ordering = ["-date"]
+        verbose_name = "Tashrif statistikasi"
+        verbose_name_plural = "Tashrif statistikasi"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["article", "date"], name="article_visitor_stat_unique"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.article_id}: {self.date} ({self.visitors})"
+
+
+class ArticleViewStat(models.Model):
+    """
+    Maqolaning bir soatdagi ko'rishlari. flush_article_views har flush'da yangi
+    qatorlar qo'shadi (faqat INSERT), rollup_article_view_stats o'tgan soatlarni
+    bitta qatorga jamlaydi, kunlik yig'indilarni yozadi va eskilarini o'chiradi.
+    """
+
+    article = models.ForeignKey(
+        Article,
+        on_delete=models.CASCADE,
+        related_name="view_stats",
+        verbose_name="Maqola",
+    )
+    hour = models.DateTimeField(verbose_name="Soat")
+    views = models.PositiveIntegerField(default=0, verbose_name="Ko'rishlar soni")
+
+    class Meta:
+        ordering = ["-hour"]
+        verbose_name = "Soatlik ko'rishlar"
+        verbose_name_plural = "Soatlik ko'rishlar"
+        indexes = [
+            models.Index(fields=["article", "hour"], name="article_view_stat_hour"),
+            # rollup va eskilarini o'chirish uchun
+            models.Index(fields=["hour"], name="article_view_stat_prune"),
+        ]
+
+    def __str__(self):
+        return f"{self.article_id}: {self.hour} ({self.views})"
+
+
+class ArticleDailyViewStat(models.Model):
+    """
+    Maqolaning bir kundagi ko'rishlari, ArticleViewStat dan jamlanadi.
+    """
+
+    article = models.ForeignKey(
+        Article,
+        on_delete=models.CASCADE,
+        related_name="daily_view_stats",
+        verbose_name="Maqola",
+    )
+    date = models.DateField(verbose_name="Sana")
+    views = models.PositiveIntegerField(default=0, verbose_name="Ko'rishlar soni")
+
+    class Meta:
+        ordering = ["-date"]
+        verbose_name = "Kunlik ko'rishlar"
+        verbose_name_plural = "Kunlik ko'rishlar"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["article", "date"], name="article_daily_view_stat_unique"
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["date"], name="article_daily_view_stat_prune"),
+        ]
+
+    def __str__(self):
+        return f"{self.article_id}: {self.date} ({self.views})"
+
+
 class Comment(models.Model):
     """
     Maqolalarga yozilgan izohlar.
@@ -137,6 +502,13 @@ class Comment(models.Model):
     is_active = models.BooleanField(default=True, help_text="Admin tomonidan tasdiqlangan izohlar saytda ko'rinadi.")
     created_at = models.DateTimeField(auto_now_add=True)
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Article.comment_count ni yangilash uchun bazadagi holat (signals.py)
+        instance._loaded_is_active = instance.__dict__.get("is_active")
+        return instance
+
     class Meta:
         ordering = ['created_at'] # Eng eski izohlar birinchi ko'rinadi
         verbose_name = "Izoh"
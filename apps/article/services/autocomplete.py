@@ -0,0 +1,103 @@
+import json
+
+from apps.common.services.redis_client import get_redis_client
+from apps.text_services import cyrillic_latin_translator
+
+ARTICLE = "article"
+TAG = "tag"
+CATEGORY = "category"
+
+INDEX_KEY = "autocomplete:index"
+LABELS_KEY = "autocomplete:labels"
+DOCUMENT_KEY = "autocomplete:doc:{}"
+
+# bundan uzun prefikslar bilan baribir qidirilmaydi
+MAX_ENTRY_LENGTH = 64
+SEPARATOR = "\x00"
+
+
+class AutocompleteIndex:
+    """
+    Maqola sarlavhalari, teg va kategoriya nomlarining Redis sorted set'dagi prefiks indeksi.
+
+    Nomning fold qilingan ko'rinishidagi (cyrillic_latin_translator.fold) har bir
+    so'z boshidan "<shu so'zdan keyingi matn>\\x00<tur>:<id>" ko'rinishidagi
+    a'zo 0 ball bilan saqlanadi, shuning uchun prefiks bilan boshlanuvchi barcha
+    yozuvlar bitta ZRANGEBYLEX oralig'i bo'ladi. Lotin va kirillda yozilgan
+    prefikslar bir xil matnga keladi. Foydalanuvchiga ko'rsatiladigan nomlar
+    hash'da, har bir hujjatning a'zolari esa o'chirish uchun alohida set'da saqlanadi.
+    """
+
+    def __init__(self, client=None):
+        self.client = client or get_redis_client()
+
+    @staticmethod
+    def document_id(kind, pk):
+        return f"{kind}:{pk}"
+
+    @staticmethod
+    def entries(name):
+        folded = cyrillic_latin_translator.fold(name)
+        words = folded.split()
+        return {" ".join(words[i:])[:MAX_ENTRY_LENGTH] for i in range(len(words))}
+
+    def add(self, kind, pk, name, slug):
+        document_id = self.document_id(kind, pk)
+        document_key = DOCUMENT_KEY.format(document_id)
+        old_members = self.client.smembers(document_key)
+        members = [
+            f"{entry}{SEPARATOR}{document_id}".encode() for entry in self.entries(name)
+        ]
+        label = json.dumps({"type": kind, "id": pk, "label": name, "slug": slug})
+
+        pipe = self.client.pipeline()
+        if old_members:
+            pipe.zrem(INDEX_KEY, *old_members)
+        pipe.delete(document_key)
+        if members:
+            pipe.zadd(INDEX_KEY, dict.fromkeys(members, 0))
+            pipe.sadd(document_key, *members)
+        pipe.hset(LABELS_KEY, document_id, label)
+        pipe.execute()
+
+    def remove(self, kind, pk):
+        document_id = self.document_id(kind, pk)
+        document_key = DOCUMENT_KEY.format(document_id)
+        old_members = self.client.smembers(document_key)
+
+        pipe = self.client.pipeline()
+        if old_members:
+            pipe.zrem(INDEX_KEY, *old_members)
+        pipe.delete(document_key)
+        pipe.hdel(LABELS_KEY, document_id)
+        pipe.execute()
+
+    def clear(self):
+        pipe = self.client.pipeline()
+        pipe.delete(INDEX_KEY, LABELS_KEY)
+        for key in self.client.scan_iter(match=DOCUMENT_KEY.format("*"), count=1000):
+            pipe.delete(key)
+        pipe.execute()
+
+    def suggest(self, prefix, limit=10):
+        """Biror so'zi `prefix` bilan boshlanadigan `limit` tagacha yozuvni qaytaradi."""
+        folded = " ".join(cyrillic_latin_translator.fold(prefix).split())
+        if not folded:
+            return []
+        start = b"[" + folded.encode()
+        # prefiks bilan boshlanuvchi barcha a'zolar prefiks + 0xff dan oldin turadi
+        members = self.client.zrangebylex(
+            INDEX_KEY, start, start + b"\xff", start=0, num=limit * 4
+        )
+
+        document_ids = []
+        for member in members:
+            document_id = member.rsplit(SEPARATOR.encode(), 1)[1].decode()
+            if document_id not in document_ids:
+                document_ids.append(document_id)
+            if len(document_ids) == limit:
+                break
+        if not document_ids:
+            return []
+        labels = self.client.hmget(LABELS_KEY, document_ids)
+        return [json.loads(label) for label in labels if label is not None]
@@ -0,0 +1,153 @@
+import math
+import time
+
+from django.conf import settings
+
+from apps.common.services.redis_client import get_redis_client
+
+GLOBAL_KEY = "trending:articles"
+CATEGORY_KEY = "trending:category:{}"
+TAG_KEY = "trending:tag:{}"
+# barcha trending sorted set kalitlari (rescale ularni aylanib chiqadi)
+KEYS_KEY = "trending:keys"
+# ballar hisoblangan boshlang'ich vaqt (unix soniya)
+EPOCH_KEY = "trending:epoch"
+
+# exp() float chegarasidan (~709) ancha past: rescale uzoq ishlamasa ballar to'lib ketmaydi
+MAX_EXPONENT = 600
+
+# epoch'ni o'qib, ZINCRBY qilish atomik bo'lishi uchun: rescale bilan poyga bo'lmaydi
+INCR_SCRIPT = f"""
+local MAX_EXPONENT = {MAX_EXPONENT}
+local epoch = tonumber(redis.call("GET", KEYS[1]))
+if not epoch then
+    epoch = tonumber(ARGV[1])
+    redis.call("SET", KEYS[1], ARGV[1])
+end
+local exponent = (tonumber(ARGV[1]) - epoch) / tonumber(ARGV[2])
+if exponent > MAX_EXPONENT then
+    return redis.error_reply("trending epoch is stale, run rescale_trending_scores")
+end
+local increment = tonumber(ARGV[3]) * math.exp(exponent)
+for i = 3, #KEYS do
+    redis.call("ZINCRBY", KEYS[i], increment, ARGV[4])
+    redis.call("SADD", KEYS[2], KEYS[i])
+end
+return tostring(increment)
+"""
+
+# rescale bo'shatgan (Redis o'chirgan) sorted set'larni KEYS_KEY dan olib tashlaydi;
+# skript atomik, shuning uchun shu orada INCR_SCRIPT qo'shgan kalit o'chib ketmaydi
+PRUNE_KEYS_SCRIPT = """
+local removed = 0
+for _, key in ipairs(redis.call("SMEMBERS", KEYS[1])) do
+    if redis.call("EXISTS", key) == 0 then
+        redis.call("SREM", KEYS[1], key)
+        removed = removed + 1
+    end
+end
+return removed
+"""
+
+
+class TrendingIndex:
+    """
+    Eksponensial so'nuvchi (TRENDING_HALF_LIFE) ko'rish va izoh ballari bo'yicha
+    maqolalar reytingi: umumiy, har bir kategoriya va teg uchun Redis sorted set.
+
+    Eski ballarni kamaytirish o'rniga yangi hodisa og'irligi
+    exp((hozir - epoch) / tau) ga ko'paytiriladi (forward decay), shuning uchun
+    tartib istalgan paytda to'g'ri. rescale_trending_scores vazifasi davriy
+    ravishda barcha ballarni ZUNIONSTORE WEIGHTS bilan hozirgi vaqtga keltiradi
+    (ballar chegaralangan qoladi), juda kichik ballarni va TRENDING_MAX_SIZE
+    dan ortiqlarini o'chiradi.
+    """
+
+    def __init__(self, client=None):
+        self.client = client or get_redis_client()
+        self.incr_script = self.client.register_script(INCR_SCRIPT)
+        self.prune_keys_script = self.client.register_script(PRUNE_KEYS_SCRIPT)
+
+    @staticmethod
+    def tau():
+        return settings.TRENDING_HALF_LIFE / math.log(2)
+
+    @staticmethod
+    def keys(category_slug=None, tag_slugs=()):
+        keys = [GLOBAL_KEY]
+        if category_slug:
+            keys.append(CATEGORY_KEY.format(category_slug))
+        keys.extend(TAG_KEY.format(slug) for slug in tag_slugs)
+        return keys
+
+    def add(self, article_id, weight, category_slug=None, tag_slugs=(), now=None):
+        now = time.time() if now is None else now
+        return float(
+            self.incr_script(
+                keys=[EPOCH_KEY, KEYS_KEY, *self.keys(category_slug, tag_slugs)],
+                args=[now, self.tau(), weight, article_id],
+            )
+        )
+
+    def add_view(self, article_id, category_slug=None, tag_slugs=()):
+        return self.add(
+            article_id, settings.TRENDING_VIEW_WEIGHT, category_slug, tag_slugs
+        )
+
+    def add_comment(self, article_id, category_slug=None, tag_slugs=()):
+        return self.add(
+            article_id, settings.TRENDING_COMMENT_WEIGHT, category_slug, tag_slugs
+        )
+
+    def top(self, limit, category_slug=None, tag_slug=None):
+        """Eng yuqori ballli maqola id lari (bitta ZREVRANGE)."""
+        if category_slug:
+            key = CATEGORY_KEY.format(category_slug)
+        elif tag_slug:
+            key = TAG_KEY.format(tag_slug)
+        else:
+            key = GLOBAL_KEY
+        return [int(pk) for pk in self.client.zrevrange(key, 0, limit - 1)]
+
+    def remove(self, article_id):
+        keys = self.client.smembers(KEYS_KEY)
+        if not keys:
+            return
+        pipe = self.client.pipeline(transaction=False)
+        for key in keys:
+            pipe.zrem(key, article_id)
+        pipe.execute()
+
+    def rescale(self, now=None):
+        """
+        Ballarni `now` ga keltiradi va epoch'ni yangilaydi, qayta hisoblangan
+        kalitlar sonini qaytaradi. Hammasi bitta MULTI/EXEC'da; shu orada yangi
+        kalit qo'shilsa (WATCH) qaytadan boshlanadi. Keyin bo'shab qolgan
+        kalitlar KEYS_KEY dan o'chiriladi (prune_keys).
+        """
+        now = time.time() if now is None else now
+        min_score = settings.TRENDING_MIN_SCORE
+        max_size = settings.TRENDING_MAX_SIZE
+
+        def rescale_keys(pipe):
+            epoch = pipe.get(EPOCH_KEY)
+            keys = pipe.smembers(KEYS_KEY)
+            pipe.multi()
+            if epoch is not None:
+                factor = math.exp((float(epoch) - now) / self.tau())
+                for key in keys:
+                    pipe.zunionstore(key, {key: factor})
+                    pipe.zremrangebyscore(key, "-inf", f"({min_score}")
+                    pipe.zremrangebyrank(key, 0, -(max_size + 1))
+            pipe.set(EPOCH_KEY, now)
+            return len(keys) if epoch is not None else 0
+
+        rescaled = self.client.transaction(
+            rescale_keys, EPOCH_KEY, KEYS_KEY, value_from_callable=True
+        )
+        self.prune_keys()
+        return rescaled
+
+    def prune_keys(self):
+        """Mavjud bo'lmagan sorted set'larni KEYS_KEY dan o'chiradi, o'chirilganlar sonini qaytaradi."""
+        return int(self.prune_keys_script(keys=[KEYS_KEY]))
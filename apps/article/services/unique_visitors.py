@@ -0,0 +1,151 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Case, Value, When
+from django.utils import timezone
+from django.utils.crypto import salted_hmac
+
+from apps.article.models import Article, ArticleVisitorStat
+from apps.common.services.redis_client import get_redis_client
+
+TOTAL_KEY = "article:visitors:{}"
+DAILY_KEY = "article:visitors:{}:{}"
+# shu kuni ko'rilgan maqolalar (rollup qaysi HLL'larni o'qishini biladi)
+TOUCHED_KEY = "article:visitors:touched:{}"
+
+# kunlik kalitlar rollup kechiksa ham o'qilishi uchun bir necha kun saqlanadi
+DAILY_KEY_TTL = 3 * 24 * 60 * 60
+
+# bitta pipeline / UPDATE dagi maqolalar soni
+ROLLUP_BATCH_SIZE = 500
+
+
+def client_ip(request) -> str:
+    """
+    Tashrif buyuruvchining IP manzili. X-Forwarded-For ning chap qismini mijoz
+    o'zi yozishi mumkin, shuning uchun ishonchli proksilar
+    (ARTICLE_VISITORS_TRUSTED_PROXIES) qo'shgan oxirgi yozuvlardan eng chetdagisi
+    olinadi; proksi bo'lmasa yoki sarlavha qisqa bo'lsa REMOTE_ADDR.
+    """
+    remote_addr = request.META.get("REMOTE_ADDR", "")
+    proxies = settings.ARTICLE_VISITORS_TRUSTED_PROXIES
+    if proxies <= 0:
+        return remote_addr
+    forwarded = [
+        entry.strip()
+        for entry in request.META.get("HTTP_X_FORWARDED_FOR", "").split(",")
+        if entry.strip()
+    ]
+    if len(forwarded) < proxies:
+        return remote_addr
+    return forwarded[-proxies]
+
+
+def visitor_fingerprint(request) -> str:
+    """
+    Tashrif buyuruvchining xeshlangan belgisi: foydalanuvchi id si yoki
+    IP (client_ip) + User-Agent. Redis'ga faqat HMAC yoziladi, IP emas.
+    """
+    user = getattr(request, "user", None)
+    if user is not None and user.is_authenticated:
+        raw = f"user:{user.pk}"
+    else:
+        raw = f"anon:{client_ip(request)}:{request.META.get('HTTP_USER_AGENT', '')}"
+    return salted_hmac("apps.article.visitor", raw).hexdigest()[:32]
+
+
+class UniqueVisitorCounter:
+    """
+    Maqolaning noyob tashrif buyuruvchilarini Redis HyperLogLog (PFADD) larida
+    taxminan sanaydi: har bir maqola uchun umumiy va kunlik (TTL bilan) kalit.
+    Har bir HLL trafikdan qat'i nazar ~12 KB, xatosi ~0.81%.
+
+    rollup_article_visitors Celery vazifasi PFCOUNT natijalarini
+    ArticleVisitorStat jadvaliga va Article.unique_visitors ga yozadi.
+    """
+
+    def __init__(self, client=None):
+        self.client = client or get_redis_client()
+
+    def add(self, article_id, fingerprint, day=None):
+        day = (day or timezone.localdate()).isoformat()
+        daily_key = DAILY_KEY.format(article_id, day)
+        touched_key = TOUCHED_KEY.format(day)
+        pipe = self.client.pipeline(transaction=False)
+        pipe.pfadd(TOTAL_KEY.format(article_id), fingerprint)
+        pipe.pfadd(daily_key, fingerprint)
+        pipe.expire(daily_key, DAILY_KEY_TTL)
+        pipe.sadd(touched_key, article_id)
+        pipe.expire(touched_key, DAILY_KEY_TTL)
+        pipe.execute()
+
+    def count(self, article_id, day=None):
+        if day is None:
+            return self.client.pfcount(TOTAL_KEY.format(article_id))
+        return self.client.pfcount(DAILY_KEY.format(article_id, day.isoformat()))
+
+    def rollup(self, days=None):
+        """
+        Oxirgi `days` kunning (bugun ham) hisoblarini bazaga yozadi,
+        yozilgan (maqola, kun) juftlari sonini qaytaradi.
+        """
+        if days is None:
+            days = settings.ARTICLE_VISITORS_ROLLUP_DAYS
+        today = timezone.localdate()
+        written = 0
+        touched_ids = set()
+        for offset in range(days):
+            day = today - timedelta(days=offset)
+            article_ids = sorted(
+                int(pk)
+                for pk in self.client.smembers(TOUCHED_KEY.format(day.isoformat()))
+            )
+            touched_ids.update(article_ids)
+            for start in range(0, len(article_ids), ROLLUP_BATCH_SIZE):
+                batch = article_ids[start : start + ROLLUP_BATCH_SIZE]
+                written += self.write_daily(day, batch)
+        self.write_totals(sorted(touched_ids))
+        return written
+
+    def write_daily(self, day, article_ids):
+        pipe = self.client.pipeline(transaction=False)
+        for article_id in article_ids:
+            pipe.pfcount(DAILY_KEY.format(article_id, day.isoformat()))
+        counts = dict(zip(article_ids, pipe.execute()))
+        existing = Article.objects.filter(pk__in=article_ids).values_list(
+            "pk", flat=True
+        )
+        stats = [
+            ArticleVisitorStat(article_id=pk, date=day, visitors=counts[pk])
+            for pk in existing
+        ]
+        ArticleVisitorStat.objects.bulk_create(
+            stats,
+            update_conflicts=True,
+            unique_fields=["article", "date"],
+            update_fields=["visitors"],
+        )
+        return len(stats)
+
+    def write_totals(self, article_ids):
+        for start in range(0, len(article_ids), ROLLUP_BATCH_SIZE):
+            batch = article_ids[start : start + ROLLUP_BATCH_SIZE]
+            pipe = self.client.pipeline(transaction=False)
+            for article_id in batch:
+                pipe.pfcount(TOTAL_KEY.format(article_id))
+            totals = pipe.execute()
+            with transaction.atomic():
+                Article.objects.filter(pk__in=batch).update(
+                    unique_visitors=Case(
+                        *[
+                            When(pk=pk, then=Value(total))
+                            for pk, total in zip(batch, totals)
+                        ],
+                        default=Value(0),
+                    )
+                )
+
+    def forget(self, article_id):
+        """O'chirilgan maqolaning umumiy HLL'ini o'chiradi (kunliklari TTL bilan tugaydi)."""
+        self.client.delete(TOTAL_KEY.format(article_id))
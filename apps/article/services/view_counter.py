@@ -0,0 +1,80 @@
+import redis
+from django.db import transaction
+from django.db.models import Case, F, Value, When
+
+from apps.article.models import Article
+from apps.common.services.redis_client import get_redis_client
+
+from .view_stats import ViewStats
+
+PENDING_KEY = "article:views:pending"
+FLUSHING_KEY = "article:views:flushing"
+FLUSH_LOCK_KEY = "article:views:flush-lock"
+
+# bitta UPDATE dagi maqolalar soni
+FLUSH_BATCH_SIZE = 500
+
+
+class ViewCounter:
+    """
+    Maqola ko'rishlarini Redis hash'ida (HINCRBY) yig'adi, bazaga esa
+    flush_article_views Celery vazifasi davriy ravishda bitta UPDATE bilan yozadi.
+    Shu sababli o'qishlar Article qatorini qulflamaydi.
+
+    Flush vaqtida yig'ilgan hash RENAME bilan FLUSHING_KEY ga o'tkaziladi, yangi
+    ko'rishlar esa yana PENDING_KEY ga yoziladi. Flush bazaga yozishdan oldin
+    to'xtasa, keyingi flush FLUSHING_KEY dagi qiymatlarni qayta yozadi.
+    """
+
+    def __init__(self, client=None):
+        self.client = client or get_redis_client()
+
+    def incr(self, article_id):
+        """Ko'rishni qo'shadi va bazaga hali yozilmagan ko'rishlar sonini qaytaradi."""
+        pipe = self.client.pipeline(transaction=False)
+        pipe.hincrby(PENDING_KEY, article_id, 1)
+        pipe.hget(FLUSHING_KEY, article_id)
+        pending, flushing = pipe.execute()
+        return pending + int(flushing or 0)
+
+    def flush(self):
+        """Yig'ilgan ko'rishlarni bazaga yozadi, yangilangan maqolalar sonini qaytaradi."""
+        lock = self.client.lock(FLUSH_LOCK_KEY, timeout=5 * 60)
+        if not lock.acquire(blocking=False):
+            # boshqa flush ishlayapti
+            return 0
+        try:
+            if not self.client.exists(FLUSHING_KEY):
+                try:
+                    self.client.rename(PENDING_KEY, FLUSHING_KEY)
+                except redis.ResponseError:
+                    # PENDING_KEY yo'q: yangi ko'rishlar bo'lmagan
+                    return 0
+            deltas = {
+                int(article_id): int(delta)
+                for article_id, delta in self.client.hgetall(FLUSHING_KEY).items()
+            }
+            self.apply(deltas)
+            self.client.delete(FLUSHING_KEY)
+            return len(deltas)
+        finally:
+            try:
+                lock.release()
+            except redis.exceptions.LockError:
+                pass
+
+    @staticmethod
+    def apply(deltas):
+        """view_count ni oshiradi va ko'rishlarni joriy soat statistikasiga (ArticleViewStat) yozadi."""
+        items = sorted(deltas.items())
+        with transaction.atomic():
+            for start in range(0, len(items), FLUSH_BATCH_SIZE):
+                batch = items[start : start + FLUSH_BATCH_SIZE]
+                Article.objects.filter(pk__in=[pk for pk, _ in batch]).update(
+                    view_count=F("view_count")
+                    + Case(
+                        *[When(pk=pk, then=Value(delta)) for pk, delta in batch],
+                        default=Value(0),
+                    )
+                )
+                ViewStats.record(dict(batch))
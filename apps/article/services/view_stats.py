@@ -0,0 +1,149 @@
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from apps.article.models import Article, ArticleDailyViewStat, ArticleViewStat
+
+# har rollup'da qayta jamlanadigan kunlar (bugun ham)
+ROLLUP_DAYS = 2
+
+# bitta INSERT dagi qatorlar soni
+BATCH_SIZE = 500
+
+
+def current_hour(now=None):
+    return (now or timezone.now()).replace(minute=0, second=0, microsecond=0)
+
+
+class ViewStats:
+    """
+    Maqola ko'rishlarining vaqt bo'yicha statistikasi: ArticleViewStat (soatlik)
+    va ArticleDailyViewStat (kunlik).
+
+    Soatlik qatorlar faqat qo'shiladi: ViewCounter.apply har flush'da yangi
+    ko'rishlarni joriy soatga yozadi, shuning uchun har ko'rish uchun alohida
+    qator bo'lmaydi. rollup() tugagan soatlarning qatorlarini bittaga jamlaydi,
+    kunlik yig'indilarni yangilaydi va saqlash muddati o'tganlarini o'chiradi.
+    Grafiklar shu jadvallardan o'qiladi.
+    """
+
+    @staticmethod
+    def record(deltas, hour=None):
+        """`deltas` ({maqola id: ko'rishlar}) ni `hour` soatiga qo'shadi."""
+        hour = hour or current_hour()
+        existing = Article.objects.filter(pk__in=list(deltas)).values_list(
+            "pk", flat=True
+        )
+        ArticleViewStat.objects.bulk_create(
+            [
+                ArticleViewStat(article_id=pk, hour=hour, views=deltas[pk])
+                for pk in existing
+            ],
+            batch_size=BATCH_SIZE,
+        )
+
+    def rollup(self, now=None):
+        now = now or timezone.now()
+        since = current_hour(now) - timedelta(days=ROLLUP_DAYS)
+        with transaction.atomic():
+            compacted = self.compact_hours(since, current_hour(now))
+            days = self.rollup_days(
+                timezone.localdate(now) - timedelta(days=ROLLUP_DAYS - 1)
+            )
+        pruned = self.prune(now)
+        return {"compacted": compacted, "days": days, "pruned": pruned}
+
+    @staticmethod
+    def compact_hours(since, until):
+        """
+        [since, until) soatlarida bir nechta qatori bor (maqola, soat) larni bittaga
+        jamlaydi. Faqat o'qilgan qatorlar (id bo'yicha) o'chiriladi: shu orada
+        flush yozgan qator yo'qolmaydi, keyingi rollup'da jamlanadi.
+        """
+        groups = (
+            ArticleViewStat.objects.filter(hour__gte=since, hour__lt=until)
+            .values("article_id", "hour")
+            .annotate(rows=Count("id"))
+            .filter(rows__gt=1)
+            .order_by()
+        )
+        by_hour = {}
+        for group in groups:
+            by_hour.setdefault(group["hour"], []).append(group["article_id"])
+        for hour, article_ids in by_hour.items():
+            rows = ArticleViewStat.objects.filter(
+                hour=hour, article_id__in=article_ids
+            ).values_list("id", "article_id", "views")
+            ids = []
+            totals = {}
+            for pk, article_id, views in rows:
+                ids.append(pk)
+                totals[article_id] = totals.get(article_id, 0) + views
+            ArticleViewStat.objects.filter(pk__in=ids).delete()
+            ArticleViewStat.objects.bulk_create(
+                [
+                    ArticleViewStat(article_id=article_id, hour=hour, views=total)
+                    for article_id, total in totals.items()
+                ],
+                batch_size=BATCH_SIZE,
+            )
+        return sum(len(article_ids) for article_ids in by_hour.values())
+
+    @staticmethod
+    def rollup_days(since):
+        """`since` kunidan boshlab kunlik yig'indilarni soatlik qatorlardan qayta yozadi."""
+        tzinfo = timezone.get_current_timezone()
+        start = timezone.make_aware(datetime.combine(since, time.min), tzinfo)
+        rows = (
+            ArticleViewStat.objects.filter(hour__gte=start)
+            .annotate(date=TruncDate("hour", tzinfo=tzinfo))
+            .values("article_id", "date")
+            .annotate(total=Sum("views"))
+            .order_by()
+        )
+        stats = [
+            ArticleDailyViewStat(
+                article_id=row["article_id"], date=row["date"], views=row["total"]
+            )
+            for row in rows
+        ]
+        ArticleDailyViewStat.objects.bulk_create(
+            stats,
+            batch_size=BATCH_SIZE,
+            update_conflicts=True,
+            unique_fields=["article", "date"],
+            update_fields=["views"],
+        )
+        return len(stats)
+
+    @staticmethod
+    def prune(now):
+        hourly, _ = ArticleViewStat.objects.filter(
+            hour__lt=now - timedelta(days=settings.ARTICLE_VIEW_STATS_HOURLY_RETENTION)
+        ).delete()
+        daily, _ = ArticleDailyViewStat.objects.filter(
+            date__lt=timezone.localdate(now)
+            - timedelta(days=settings.ARTICLE_VIEW_STATS_DAILY_RETENTION)
+        ).delete()
+        return hourly + daily
+
+    @staticmethod
+    def hourly(article_id, since):
+        return (
+            ArticleViewStat.objects.filter(article_id=article_id, hour__gte=since)
+            .values("hour")
+            .annotate(total=Sum("views"))
+            .order_by("hour")
+        )
+
+    @staticmethod
+    def daily(article_id, since):
+        return (
+            ArticleDailyViewStat.objects.filter(article_id=article_id, date__gte=since)
+            .values("date", total=F("views"))
+            .order_by("date")
+        )
@@ -0,0 +1,171 @@
+import logging
+from functools import partial
+
+import redis
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.text_services.search_cache import SearchResultCache
+
+from .models import Article, Category, Comment, Tag
+from .services import autocomplete
+from .services.trending import TrendingIndex
+from .services.unique_visitors import UniqueVisitorCounter
+
+logger = logging.getLogger(__name__)
+
+
+def _on_commit(func, *args):
+    """
+    Autocomplete indeksini tranzaksiya muvaffaqiyatli tugagandan keyin yangilaydi.
+    Redis ishlamasa saqlash buzilmaydi, xato faqat logga yoziladi
+    (indeksni rebuild_autocomplete_index bilan tiklash mumkin).
+    """
+
+    def run():
+        try:
+            func(autocomplete.AutocompleteIndex(), *args)
+        except redis.RedisError:
+            logger.warning("Autocomplete index update failed", exc_info=True)
+
+    transaction.on_commit(run)
+
+
+@receiver(post_save, sender=Article)
+def index_article(sender, instance, **kwargs):
+    if instance.status == Article.Status.PUBLISHED:
+        _on_commit(
+            autocomplete.AutocompleteIndex.add,
+            autocomplete.ARTICLE,
+            instance.pk,
+            instance.title,
+            instance.slug,
+        )
+    else:
+        _on_commit(
+            autocomplete.AutocompleteIndex.remove, autocomplete.ARTICLE, instance.pk
+        )
+
+
+@receiver(post_delete, sender=Article)
+def unindex_article(sender, instance, **kwargs):
+    _on_commit(autocomplete.AutocompleteIndex.remove, autocomplete.ARTICLE, instance.pk)
+
+
+@receiver(post_delete, sender=Article)
+def forget_article_visitors(sender, instance, **kwargs):
+    article_id = instance.pk
+
+    def run():
+        try:
+            UniqueVisitorCounter().forget(article_id)
+        except redis.RedisError:
+            logger.warning("Unique visitors cleanup failed", exc_info=True)
+
+    transaction.on_commit(run)
+
+
+@receiver(post_save, sender=Article)
+@receiver(post_delete, sender=Article)
+def untrend_article(sender, instance, **kwargs):
+    """Nashrdan olingan yoki o'chirilgan maqolani trending reytinglaridan chiqaradi."""
+    if (
+        kwargs.get("signal") is post_save
+        and instance.status == Article.Status.PUBLISHED
+    ):
+        return
+    article_id = instance.pk
+
+    def run():
+        try:
+            TrendingIndex().remove(article_id)
+        except redis.RedisError:
+            logger.warning("Trending index update failed", exc_info=True)
+
+    transaction.on_commit(run)
+
+
+@receiver(post_save, sender=Tag)
+@receiver(post_save, sender=Category)
+def index_taxonomy(sender, instance, **kwargs):
+    kind = autocomplete.TAG if sender is Tag else autocomplete.CATEGORY
+    _on_commit(
+        autocomplete.AutocompleteIndex.add,
+        kind,
+        instance.pk,
+        instance.name,
+        instance.slug,
+    )
+
+
+@receiver(post_delete, sender=Tag)
+@receiver(post_delete, sender=Category)
+def unindex_taxonomy(sender, instance, **kwargs):
+    kind = autocomplete.TAG if sender is Tag else autocomplete.CATEGORY
+    _on_commit(autocomplete.AutocompleteIndex.remove, kind, instance.pk)
+
+
+@receiver(post_save, sender=Article)
+@receiver(post_delete, sender=Article)
+@receiver(post_save, sender=Tag)
+@receiver(post_delete, sender=Tag)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_search_cache(sender, **kwargs):
+    """
+    Maqola nashr qilinsa, tahrirlansa, arxivlansa yoki o'chirilsa (teg va kategoriya
+    nomlari ham qidiriladi) cache'langan qidiruv natijalari versiyasini oshiradi.
+    """
+    transaction.on_commit(
+        SearchResultCache(Article.SEARCH_CACHE_VERSION_KEY).bump_version
+    )
+
+
+def _change_comment_count(article_id, delta):
+    articles = Article.objects.filter(pk=article_id)
+    if delta < 0:
+        articles = articles.filter(comment_count__gte=-delta)
+    articles.update(comment_count=F("comment_count") + delta)
+
+
+@receiver(post_save, sender=Comment)
+def count_saved_comment(sender, instance, created, **kwargs):
+    """
+    Article.comment_count ni izoh yaratilganda yoki is_active o'zgarganda atomik yangilaydi.
+    QuerySet.update() signal yubormaydi, bunday o'zgarishlarni reconcile_comment_counts tuzatadi.
+    """
+    if created:
+        was_active = False
+    else:
+        was_active = getattr(instance, "_loaded_is_active", instance.is_active)
+    if instance.is_active != was_active:
+        _change_comment_count(instance.article_id, 1 if instance.is_active else -1)
+    if created and instance.is_active and settings.ARTICLE_TRENDING:
+        transaction.on_commit(partial(_trend_comment, instance.article_id))
+    instance._loaded_is_active = instance.is_active
+
+
+def _trend_comment(article_id):
+    article = (
+        Article.objects.filter(pk=article_id, status=Article.Status.PUBLISHED)
+        .values("category__slug")
+        .first()
+    )
+    if article is None:
+        return
+    tag_slugs = Tag.objects.filter(articles=article_id).values_list("slug", flat=True)
+    try:
+        TrendingIndex().add_comment(
+            article_id, article["category__slug"], list(tag_slugs)
+        )
+    except redis.RedisError:
+        logger.warning("Trending index update failed", exc_info=True)
+
+
+@receiver(post_delete, sender=Comment)
+def count_deleted_comment(sender, instance, **kwargs):
+    if getattr(instance, "_loaded_is_active", instance.is_active):
+        _change_comment_count(instance.article_id, -1)
@@ -0,0 +1,30 @@
+from celery import shared_task
+
+from apps.article.services.trending import TrendingIndex
+from apps.article.services.unique_visitors import UniqueVisitorCounter
+from apps.article.services.view_counter import ViewCounter
+from apps.article.services.view_stats import ViewStats
+
+
+@shared_task
+def flush_article_views():
+    """Redis'da yig'ilgan maqola ko'rishlarini Article.view_count ga yozadi."""
+    return ViewCounter().flush()
+
+
+@shared_task
+def rollup_article_visitors():
+    """Redis HyperLogLog'laridagi noyob tashrif buyuruvchilarni ArticleVisitorStat ga yozadi."""
+    return UniqueVisitorCounter().rollup()
+
+
+@shared_task
+def rescale_trending_scores():
+    """Trending ballarini hozirgi vaqtga keltiradi va eskirganlarini o'chiradi."""
+    return TrendingIndex().rescale()
+
+
+@shared_task
+def rollup_article_view_stats():
+    """Soatlik ko'rishlarni jamlaydi, kunlik yig'indilarni yozadi va eskilarini o'chiradi."""
+    return ViewStats().rollup()
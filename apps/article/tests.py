@@ -1,3 +1,453 @@
-from django.test import TestCase
+import base64
+import unittest
+from datetime import timedelta
+from io import StringIO
+from urllib.parse import parse_qs, urlparse
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import DatabaseError, connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient, APIRequestFactory
+
+from apps.article.api_endpoints.for_readers.serializers import (
+    ArticleListSerializer,
+    ArticleListValuesSerializer,
+)
+from apps.article.models import Article, Category, Comment, Tag
+from apps.common.deferred_fields import forbid_deferred_loads
+from apps.text_services.search_cache import SearchResultCache
+
+User = get_user_model()
+
+
+def create_article(title, **kwargs):
+    kwargs.setdefault("status", Article.Status.PUBLISHED)
+    kwargs.setdefault("published_at", timezone.now())
+    return Article.objects.create(
+        title=title,
+        excerpt=kwargs.pop("excerpt", f"{title} anonsi"),
+        content=kwargs.pop("content", f"{title} haqida maqola matni"),
+        featured_image=kwargs.pop("featured_image", "articles/test.jpg"),
+        **kwargs,
+    )
+
+
+class IncrementViewCountTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.article = create_article("Ko'rishlar")
+
+    def test_increments_and_returns_in_one_query(self):
+        with self.assertNumQueries(1):
+            view_count = Article.objects.increment_view_count(self.article.pk)
+        self.assertEqual(view_count, 1)
+        self.assertEqual(Article.objects.increment_view_count(self.article.pk), 2)
+        self.article.refresh_from_db(fields=["view_count"])
+        self.assertEqual(self.article.view_count, 2)
+
+    def test_missing_article(self):
+        with self.assertNumQueries(1):
+            self.assertIsNone(Article.objects.increment_view_count(0))
+
+
+class ArticleSaveTests(TestCase):
+    def test_full_save_keeps_counters(self):
+        article = create_article("Hisoblagichlar")
+        stale = Article.objects.get(pk=article.pk)
+        Article.objects.increment_view_count(article.pk)
+        stale.title = "Yangi sarlavha"
+        stale.save()
+        article.refresh_from_db()
+        self.assertEqual(article.title, "Yangi sarlavha")
+        self.assertEqual(article.view_count, 1)
+
+    def test_full_save_of_deleted_article_inserts_it(self):
+        article = create_article("O'chirilgan")
+        pk = article.pk
+        Article.objects.filter(pk=pk).delete()
+        article.title = "Qayta yozilgan"
+        article.save()
+        self.assertEqual(Article.objects.get(pk=pk).title, "Qayta yozilgan")
+
+    def test_update_fields_save_of_deleted_article_fails(self):
+        article = create_article("O'chirilgan")
+        Article.objects.filter(pk=article.pk).delete()
+        with self.assertRaises(DatabaseError):
+            article.save(update_fields=["title"])
+
+
+@override_settings(
+    ARTICLE_VIEWS_BUFFERED=False, ARTICLE_UNIQUE_VISITORS=False, ARTICLE_TRENDING=False
+)
+class ArticleDetailViewCountTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create_user("muallif", password="parol")
+        cls.category = Category.objects.create(name="Sport", slug="sport")
+        cls.article = create_article("Futbol", author=cls.author, category=cls.category)
+        cls.article.tags.add(Tag.objects.create(name="Jahon", slug="jahon"))
+        Comment.objects.create(article=cls.article, author=cls.author, content="Izoh")
+
+    def test_view_count_is_incremented_in_one_query(self):
+        url = reverse("article:article-detail", args=[self.article.slug])
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["view_count"], 1)
+        view_count_queries = [
+            query["sql"]
+            for query in queries.captured_queries
+            if "view_count" in query["sql"] and not query["sql"].startswith("SELECT")
+        ]
+        self.assertEqual(len(view_count_queries), 1)
+        self.assertIn("RETURNING", view_count_queries[0])
+
+    def test_query_count(self):
+        url = reverse("article:article-detail", args=[self.article.slug])
+        # ATOMIC_REQUESTS savepoint'i va uning yakuni, maqola (muallif, kategoriya
+        # bilan), teglar, izohlar, izoh mualliflari, view_count ni oshirish (UPDATE
+        # ... RETURNING, qayta SELECT yo'q), izoh javoblari
+        with self.assertNumQueries(8):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+
+
+@override_settings(ARTICLE_TRENDING=False)
+class CommentCountTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create_user("izohchi")
+        cls.article = create_article("Izohlar")
+
+    def comment(self, **kwargs):
+        return Comment.objects.create(
+            article=self.article, author=self.author, content="Izoh", **kwargs
+        )
+
+    def assertCommentCount(self, expected):
+        self.article.refresh_from_db(fields=["comment_count"])
+        self.assertEqual(self.article.comment_count, expected)
+
+    def test_create(self):
+        self.comment()
+        self.comment(is_active=False)
+        self.assertCommentCount(1)
+
+    def test_is_active_toggle(self):
+        comment = self.comment()
+        comment.is_active = False
+        comment.save()
+        self.assertCommentCount(0)
+        # o'zgarmagan is_active qayta saqlansa son o'zgarmaydi
+        comment.save()
+        self.assertCommentCount(0)
+
+        # bazadan yuklangan obyekt ham
+        comment = Comment.objects.get(pk=comment.pk)
+        comment.is_active = True
+        comment.save()
+        comment.save(update_fields=["content"])
+        self.assertCommentCount(1)
+
+    def test_delete(self):
+        active, inactive = self.comment(), self.comment(is_active=False)
+        reply = self.comment(parent=active)
+        self.assertCommentCount(2)
+        inactive.delete()
+        self.assertCommentCount(2)
+        # javoblar ham CASCADE bilan o'chadi
+        active.delete()
+        self.assertFalse(Comment.objects.filter(pk=reply.pk).exists())
+        self.assertCommentCount(0)
+
+    def test_never_below_zero(self):
+        comment = self.comment()
+        Article.objects.filter(pk=self.article.pk).update(comment_count=0)
+        comment.delete()
+        self.assertCommentCount(0)
+
+    def test_reconcile(self):
+        self.comment()
+        self.comment()
+        other = create_article("Boshqa")
+        # QuerySet.update() signal yubormaydi
+        Comment.objects.filter(article=self.article).update(is_active=False)
+        Article.objects.filter(pk=other.pk).update(comment_count=3)
+        self.assertCommentCount(2)
+
+        output = StringIO()
+        call_command("reconcile_comment_counts", stdout=output)
+        self.assertIn("2 ta maqolaning", output.getvalue())
+        self.assertCommentCount(0)
+        other.refresh_from_db(fields=["comment_count"])
+        self.assertEqual(other.comment_count, 0)
+        self.assertEqual(Article.objects.reconcile_comment_count(), 0)
+
+
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}},
+    SEARCH_CACHE_ALIAS="default",
+    SEARCH_CACHE_TIMEOUT=300,
+    ARTICLE_TRENDING=False,
+)
+class SearchCacheTests(TestCase):
+    """Qidiruv natijalari cache'i: versiyani signals.py oshiradi."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.category = Category.objects.create(name="Sport", slug="sport")
+        cls.tag = Tag.objects.create(name="Jahon", slug="jahon")
+        cls.article = create_article("Futbol", category=cls.category)
+        cls.article.tags.add(cls.tag)
+        cls.url = reverse("article:article-list")
+
+    def setUp(self):
+        cache.clear()
+        self.result_cache = SearchResultCache(Article.SEARCH_CACHE_VERSION_KEY)
+
+    def commit(self, func):
+        """func() va uning qidiruv cache'iga oid on_commit callback'lari."""
+        # autocomplete indeksi callback'lari Redis'ga murojaat qiladi, ular tashlanadi
+        with self.captureOnCommitCallbacks() as callbacks:
+            func()
+        for callback in callbacks:
+            if isinstance(getattr(callback, "__self__", None), SearchResultCache):
+                callback()
+
+    def search(self, text, **params):
+        response = self.client.get(self.url, {"search": text, **params})
+        self.assertEqual(response.status_code, 200)
+        return [row["id"] for row in response.json()["results"]]
+
+    def test_save_and_delete_bump_version(self):
+        article = create_article("Tennis")
+        tag = Tag.objects.create(name="Osiyo", slug="osiyo")
+        category = Category.objects.create(name="Madaniyat", slug="madaniyat")
+        for label, func in (
+            ("article save", self.article.save),
+            ("tag save", self.tag.save),
+            ("category save", self.category.save),
+            ("article delete", article.delete),
+            ("tag delete", tag.delete),
+            ("category delete", category.delete),
+        ):
+            with self.subTest(label):
+                version = self.result_cache.get_version()
+                self.commit(func)
+                self.assertGreater(self.result_cache.get_version(), version)
+
+    def test_version_is_bumped_after_commit(self):
+        version = self.result_cache.get_version()
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.article.save()
+        self.assertTrue(callbacks)
+        self.assertEqual(self.result_cache.get_version(), version)
+
+    def test_save_invalidates_cached_results(self):
+        self.assertEqual(self.search("jahon"), [self.article.pk])
+
+        # update() signal yubormaydi: eski natija cache'dan olinadi
+        Tag.objects.filter(pk=self.tag.pk).update(name="Osiyo")
+        self.assertEqual(self.search("jahon"), [self.article.pk])
+        self.assertEqual(self.search("osiyo"), [self.article.pk])
+
+        self.tag.name = "Osiyo"
+        self.commit(self.tag.save)
+        self.assertEqual(self.search("jahon"), [])
+        self.assertEqual(self.search("osiyo"), [self.article.pk])
+
+        self.category.name = "Jahon chempionati"
+        self.commit(self.category.save)
+        self.assertEqual(self.search("chempionat"), [self.article.pk])
+
+        other = create_article("Chempionat")
+        self.assertEqual(self.search("chempionat"), [self.article.pk])
+        self.commit(other.save)
+        self.assertCountEqual(self.search("chempionat"), [self.article.pk, other.pk])
+
+    @unittest.skipUnless(connection.vendor == "postgresql", "search_vector")
+    @override_settings(SEARCH_BACKEND="fulltext")
+    def test_cache_hit_keeps_rank_order(self):
+        now = timezone.now()
+        # yangiroq maqolalarda so'z faqat matnda: published_at bo'yicha ular oldinda
+        # bo'lardi, search_rank bo'yicha sarlavhada topilgani birinchi
+        in_content = [
+            create_article(
+                f"Yangilik {number}",
+                content="kecha voleybol " * (number + 1),
+                published_at=now - timedelta(hours=number),
+            )
+            for number in range(3)
+        ]
+        in_title = create_article(
+            "Voleybol", content="matn", published_at=now - timedelta(days=1)
+        )
+        expected = self.search("voleybol")
+        self.assertEqual(expected[0], in_title.pk)
+        self.assertCountEqual(expected, [in_title.pk, *(a.pk for a in in_content)])
+
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.search("voleybol"), expected)
+        self.assertFalse(
+            [query for query in queries.captured_queries if "ts_rank" in query["sql"]]
+        )
+        # keyingi sahifa ham shu tartibda
+        self.assertEqual(self.search("voleybol", limit=2, offset=2), expected[2:])
+
+
+class ArticleListValuesSerializerTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        author = User.objects.create_user("muallif", password="parol")
+        parent = Category.objects.create(name="Yangiliklar", slug="yangiliklar")
+        category = Category.objects.create(name="Sport", slug="sport", parent=parent)
+        tags = [
+            Tag.objects.create(name="Oʻzbekiston", slug="ozbekiston"),
+            Tag.objects.create(name="Futbol", slug="futbol"),
+        ]
+        article = create_article(
+            "Toʻliq", author=author, category=category, content="so'z " * 450
+        )
+        article.tags.set(tags)
+        create_article("Teglarsiz", author=author, category=parent).tags.set(tags[:1])
+        # muallifi, kategoriyasi, teglari va rasmi yo'q
+        create_article("Bo'sh", featured_image="", published_at=None)
+
+    def test_matches_article_list_serializer(self):
+        request = APIRequestFactory().get("/")
+        queryset = (
+            Article.objects.select_related("author", "category")
+            .prefetch_related("tags")
+            .order_by("pk")
+        )
+        expected = ArticleListSerializer(
+            queryset, many=True, context={"request": request}
+        ).data
+        rows = queryset.prefetch_related(None).values(
+            *ArticleListValuesSerializer.VALUES_FIELDS
+        )
+        actual = ArticleListValuesSerializer(list(rows), {"request": request}).data
+        self.assertEqual(len(actual), 3)
+        self.assertNotIn("author", actual[2])
+        self.assertEqual(JSONRenderer().render(actual), JSONRenderer().render(expected))
+
+
+class KeysetFeedTests(TestCase):
+    """?pagination=cursor: (published_at DESC NULLS LAST, id DESC) bo'yicha keyset."""
+
+    @classmethod
+    def setUpTestData(cls):
+        now = timezone.now()
+        # bir xil vaqtli maqolalar id bo'yicha ajratiladi
+        times = [now, now, now - timedelta(hours=1), now - timedelta(days=1)] * 2
+        cls.articles = [
+            create_article(f"Maqola {number}", published_at=published_at)
+            for number, published_at in enumerate(times)
+        ]
+        cls.articles += [
+            create_article(f"Sanasiz {number}", published_at=None)
+            for number in range(3)
+        ]
+        create_article("Qoralama", status=Article.Status.DRAFT)
+        cls.url = reverse("article:article-list")
+
+    def expected_ids(self):
+        dated = sorted(
+            (article for article in self.articles if article.published_at),
+            key=lambda article: (article.published_at, article.pk),
+            reverse=True,
+        )
+        undated = [article for article in self.articles if not article.published_at]
+        return [article.pk for article in dated + undated[::-1]]
+
+    def walk(self, url, params):
+        ids, pages = [], 0
+        while url:
+            response = self.client.get(url, params)
+            self.assertEqual(response.status_code, 200)
+            data = response.json()
+            self.assertNotIn("count", data)
+            self.assertLessEqual(len(data["results"]), 3)
+            ids += [row["id"] for row in data["results"]]
+            url, params = data["next"], None
+            pages += 1
+        return ids, pages
+
+    def test_walks_every_row_once_in_order(self):
+        # 3 talik sahifalar: sanali va sanasiz qatorlar chegarasi sahifa o'rtasida
+        ids, pages = self.walk(self.url, {"pagination": "cursor", "limit": 3})
+        self.assertEqual(ids, self.expected_ids())
+        self.assertEqual(len(set(ids)), len(ids))
+        self.assertEqual(pages, 4)
+
+    def test_page_boundary_at_first_undated_row(self):
+        ids, _ = self.walk(self.url, {"pagination": "cursor", "limit": 2})
+        self.assertEqual(ids, self.expected_ids())
+
+    def test_cursor_param_switches_to_keyset(self):
+        first = self.client.get(self.url, {"pagination": "cursor", "limit": 3}).json()
+        cursor = parse_qs(urlparse(first["next"]).query)["cursor"][0]
+        response = self.client.get(self.url, {"cursor": cursor, "limit": 3})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("count", response.json())
+        self.assertEqual(
+            [row["id"] for row in response.json()["results"]],
+            self.expected_ids()[3:6],
+        )
+
+    def test_invalid_cursor(self):
+        cursors = [
+            "yaroqsiz",
+            base64.urlsafe_b64encode(b"[]").decode(),
+            base64.urlsafe_b64encode(b'{"v": "kecha", "pk": 1}').decode(),
+            base64.urlsafe_b64encode(b'{"v": null}').decode(),
+        ]
+        for cursor in cursors:
+            with self.subTest(cursor=cursor):
+                response = self.client.get(self.url, {"cursor": cursor})
+                self.assertEqual(response.status_code, 404)
+
+
+@override_settings(
+    ARTICLE_VIEWS_BUFFERED=False, ARTICLE_UNIQUE_VISITORS=False, ARTICLE_TRENDING=False
+)
+class DeferredFieldsTests(TestCase):
+    """only() / defer() qilingan so'rovlar serializer'da qo'shimcha so'rov qilmaydi."""
+
+    client_class = APIClient
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.editor = User.objects.create_user(
+            "muharrir", password="parol", role=User.Role.EDITOR
+        )
+        category = Category.objects.create(name="Sport", slug="sport")
+        cls.article = create_article("Futbol", author=cls.editor, category=category)
+        cls.article.tags.add(Tag.objects.create(name="Jahon", slug="jahon"))
+
+    def test_editor_list(self):
+        self.client.force_authenticate(self.editor)
+        with forbid_deferred_loads():
+            response = self.client.get(reverse("article:editor-article-list-create"))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()), 1)
+
+    def test_editor_detail(self):
+        self.client.force_authenticate(self.editor)
+        url = reverse("article:editor-article-detail", args=[self.article.pk])
+        with forbid_deferred_loads():
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+
+    def test_reader_detail(self):
+        url = reverse("article:article-detail", args=[self.article.slug])
+        for params in ({}, {"script": "latin"}, {"script": "cyrillic"}):
+            with self.subTest(**params), forbid_deferred_loads():
+                response = self.client.get(url, params)
+            self.assertEqual(response.status_code, 200)
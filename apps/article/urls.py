@@ -5,6 +5,8 @@ from .api_endpoints import (
     CategoryListAPIView,
     CategoryArticleListAPIView,
     ArticleListAPIView,
+    ArticleAutocompleteAPIView,
+    ArticleTrendingAPIView,
     ArticleDetailAPIView,
     TagListAPIView,
     ArticlesByTagAPIView,
@@ -12,7 +14,8 @@ from .api_endpoints import (
     ArticleCommentsAPIView,
 
     ArticleListCreateAPIView,
-    ArticleRetrieveUpdateDestroyAPIView    
+    ArticleRetrieveUpdateDestroyAPIView,
+    ArticleViewStatsAPIView,
 )
 
 app_name = "article"
@@ -21,6 +24,8 @@ urlpatterns = [
     path("categories/", CategoryListAPIView.as_view(), name="category-list"),
     path("categories/<slug>/articles/", CategoryArticleListAPIView.as_view(), name="category-article-list   "),
     path("articles/", ArticleListAPIView.as_view(), name="article-list"),
+    path("articles/autocomplete/", ArticleAutocompleteAPIView.as_view(), name="article-autocomplete"),
+    path("articles/trending/", ArticleTrendingAPIView.as_view(), name="article-trending"),
     path("articles/<slug>/", ArticleDetailAPIView.as_view(), name="article-detail"),            
     path("tags/", TagListAPIView.as_view(), name="tag-list"),
     path("tags/<slug>/articles/", ArticlesByTagAPIView.as_view(), name="articles-by-tag"),
@@ -30,4 +35,5 @@ urlpatterns = [
     # Editor endpoints
     path("editor/articles/", ArticleListCreateAPIView.as_view(), name="editor-article-list-create"),
     path("editor/articles/<int:pk>/", ArticleRetrieveUpdateDestroyAPIView.as_view(), name="editor-article-detail"),
+    path("editor/articles/<int:pk>/stats/", ArticleViewStatsAPIView.as_view(), name="editor-article-stats"),
 ]
\ No newline at end of file
@@ -0,0 +1,34 @@
+import contextlib
+
+from django.db.models.query_utils import DeferredAttribute
+
+
+class DeferredFieldLoad(Exception):
+    pass
+
+
+@contextlib.contextmanager
+def forbid_deferred_loads():
+    """
+    Test helper: raise `DeferredFieldLoad` on every access to a field left
+    out by `.only()` / `.defer()` (each one is a query per object) inside
+    the block. `DeferredAttribute` is patched only while the block runs.
+
+        with forbid_deferred_loads():
+            response = self.client.get(url)
+    """
+    original_get = DeferredAttribute.__get__
+
+    def guarded_get(self, instance, cls=None):
+        if instance is not None and self.field.attname not in instance.__dict__:
+            raise DeferredFieldLoad(
+                f"Deferred field {type(instance).__name__}.{self.field.attname} "
+                f"loaded with an extra query"
+            )
+        return original_get(self, instance, cls)
+
+    DeferredAttribute.__get__ = guarded_get
+    try:
+        yield
+    finally:
+        DeferredAttribute.__get__ = original_get
@@ -0,0 +1,62 @@
+import copy
+
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.db.models import Index, OrderBy
+
+
+def _with_expressions(index, expressions):
+    index = copy.copy(index)
+    index.expressions = tuple(expressions)
+    return index
+
+
+class NullsOrderIndex(Index):
+    """
+    Index whose `OrderBy` expressions may use nulls_first / nulls_last.
+
+    SQLite (development) sorts NULLs as the smallest values but doesn't accept
+    NULLS FIRST / LAST in CREATE INDEX, so there the modifiers are dropped.
+    For `DESC NULLS LAST` and `ASC NULLS FIRST` that is the same order.
+    """
+
+    def create_sql(self, model, schema_editor, using="", **kwargs):
+        if schema_editor.connection.vendor != "sqlite":
+            return super().create_sql(model, schema_editor, using=using, **kwargs)
+        index = _with_expressions(
+            self,
+            [
+                OrderBy(expression.expression, descending=expression.descending)
+                if isinstance(expression, OrderBy)
+                else expression
+                for expression in self.expressions
+            ],
+        )
+        return super(NullsOrderIndex, index).create_sql(
+            model, schema_editor, using=using, **kwargs
+        )
+
+
+class OpClassGinIndex(GinIndex):
+    """
+    GinIndex on `OpClass(expression, name=...)` expressions, e.g. gin_trgm_ops.
+
+    Operator classes exist only in PostgreSQL. Elsewhere (SQLite in development)
+    the OpClass wrappers are dropped and the index is a plain one on the
+    expressions, so migrations and SQLite table rebuilds still apply there.
+    """
+
+    def create_sql(self, model, schema_editor, using="", **kwargs):
+        if schema_editor.connection.vendor == "postgresql":
+            return super().create_sql(model, schema_editor, using=using, **kwargs)
+        index = _with_expressions(
+            self,
+            [
+                expression.get_source_expressions()[0]
+                if isinstance(expression, OpClass)
+                else expression
+                for expression in self.expressions
+            ],
+        )
+        return super(OpClassGinIndex, index).create_sql(
+            model, schema_editor, using=using, **kwargs
+        )
@@ -0,0 +1,289 @@
+import base64
+import binascii
+import hashlib
+import json
+import logging
+from collections import OrderedDict
+from datetime import datetime
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import EmptyResultSet
+from django.db import connections
+from django.db.models import F, Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, LimitOffsetPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+logger = logging.getLogger(__name__)
+
+
+class CachedCountLimitOffsetPagination(LimitOffsetPagination):
+    """
+    `LimitOffsetPagination` without an exact `COUNT(*)` on every request.
+
+    The count is cached under a hash of the queryset SQL (so per filter /
+    search combination) for `PAGINATION_COUNT_CACHE_TIMEOUT` seconds. On a
+    miss PostgreSQL's planner estimate (`EXPLAIN`, based on `reltuples` and
+    column statistics) is used when it is at least
+    `PAGINATION_COUNT_ESTIMATE_THRESHOLD`, otherwise the exact count.
+    `?count=exact` always counts (and refreshes the cache). Only a count made
+    for this request is exact: a cached count may be stale, so it is reported
+    as `count_is_estimate` like a planner estimate. With an estimate the page
+    is read whatever the count says, and the next link is given whenever the
+    page is full.
+
+    Used by the article feeds (`LimitOffsetOrKeysetPagination`) only, other
+    endpoints keep DRF's `LimitOffsetPagination`.
+    """
+
+    count_query_param = "count"
+    count_key_prefix = "pagination:count:v2"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        # LimitOffsetPagination.paginate_queryset, except that an estimated
+        # count doesn't cut the page: DRF returns [] past the count, which
+        # would hide rows added after the count was cached
+        self.count_is_estimate = False
+        self.request = request
+        self.limit = self.get_limit(request)
+        if self.limit is None:
+            return None
+
+        self.count = self.get_count(queryset)
+        self.offset = self.get_offset(request)
+        if self.count > self.limit and self.template is not None:
+            self.display_page_controls = True
+
+        if self.count_is_estimate or (self.count and self.offset <= self.count):
+            self.page = list(queryset[self.offset : self.offset + self.limit])
+        else:
+            self.page = []
+        return self.page
+
+    def get_count(self, queryset):
+        timeout = settings.PAGINATION_COUNT_CACHE_TIMEOUT
+        if timeout <= 0:
+            return super().get_count(queryset)
+
+        try:
+            key = self.make_count_key(queryset)
+        except EmptyResultSet:
+            # e.g. pk__in=[]: nothing to count or cache
+            return 0
+        exact = self.request.query_params.get(self.count_query_param) == "exact"
+        if not exact:
+            cached = self._cache_get(key)
+            if cached is not None:
+                # rows may have been added or removed since it was counted
+                self.count_is_estimate = True
+                return cached
+            count = self.estimate_count(queryset)
+            if (
+                count is not None
+                and count >= settings.PAGINATION_COUNT_ESTIMATE_THRESHOLD
+            ):
+                self.count_is_estimate = True
+                self._cache_set(key, count, timeout)
+                return count
+
+        count = super().get_count(queryset)
+        if count:
+            # not cached, so the first rows added show up in the count at once
+            self._cache_set(key, count, timeout)
+        return count
+
+    def make_count_key(self, queryset) -> str:
+        sql, params = queryset.order_by().query.sql_with_params()
+        digest = hashlib.sha1(f"{queryset.db}:{sql}:{params!r}".encode("utf-8"))
+        return f"{self.count_key_prefix}:{digest.hexdigest()}"
+
+    @staticmethod
+    def estimate_count(queryset):
+        connection = connections[queryset.db]
+        if connection.vendor != "postgresql":
+            return None
+        sql, params = queryset.order_by().query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+            plan = cursor.fetchone()[0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+
+    @staticmethod
+    def _cache_get(key):
+        try:
+            return caches[settings.PAGINATION_COUNT_CACHE].get(key)
+        except Exception:
+            logger.warning("Pagination count cache get failed", exc_info=True)
+            return None
+
+    @staticmethod
+    def _cache_set(key, value, timeout):
+        try:
+            caches[settings.PAGINATION_COUNT_CACHE].set(key, value, timeout)
+        except Exception:
+            logger.warning("Pagination count cache set failed", exc_info=True)
+
+    def get_next_link(self):
+        if self.count_is_estimate:
+            # the page, not the estimate, tells whether more rows follow
+            if len(self.page) < self.limit:
+                return None
+            url = self.request.build_absolute_uri()
+            url = replace_query_param(url, self.limit_query_param, self.limit)
+            return replace_query_param(
+                url, self.offset_query_param, self.offset + self.limit
+            )
+        return super().get_next_link()
+
+    def get_paginated_response(self, data):
+        return Response(
+            OrderedDict(
+                [
+                    ("count", self.count),
+                    ("count_is_estimate", self.count_is_estimate),
+                    ("next", self.get_next_link()),
+                    ("previous", self.get_previous_link()),
+                    ("results", data),
+                ]
+            )
+        )
+
+    def get_paginated_response_schema(self, schema):
+        response_schema = super().get_paginated_response_schema(schema)
+        response_schema["properties"]["count_is_estimate"] = {"type": "boolean"}
+        return response_schema
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination over `(keyset_field DESC NULLS LAST, pk DESC)`.
+
+    The cursor holds the key of the last row of the page, and the next page
+    is a range query from that key (`keyset_field <= value AND
+    (keyset_field < value OR pk < last_pk)`), so every page costs the same
+    at any depth given an index on `(keyset_field DESC NULLS LAST, pk DESC)`.
+    Rows without a `keyset_field` value come last, ordered by pk. There is
+    no count query and no previous link; the queryset ordering is replaced.
+    """
+
+    page_size = api_settings.PAGE_SIZE
+    page_size_query_param = "limit"
+    max_page_size = 100
+    cursor_query_param = "cursor"
+    keyset_field = "published_at"
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        position = self.decode_cursor(request)
+        field = self.keyset_field
+
+        rows = []
+        if position is None or position[0] is not None:
+            if position is None:
+                head = queryset.filter(**{f"{field}__isnull": False})
+            else:
+                value, pk = position
+                head = queryset.filter(
+                    Q(**{f"{field}__lte": value})
+                    & (Q(**{f"{field}__lt": value}) | Q(pk__lt=pk))
+                )
+            head = head.order_by(F(field).desc(nulls_last=True), "-pk")
+            rows = list(head[: self.page_size + 1])
+
+        if len(rows) <= self.page_size:
+            tail = queryset.filter(**{f"{field}__isnull": True})
+            if position is not None and position[0] is None:
+                tail = tail.filter(pk__lt=position[1])
+            rows += list(tail.order_by("-pk")[: self.page_size + 1 - len(rows)])
+
+        self.has_next = len(rows) > self.page_size
+        self.page = rows[: self.page_size]
+        return self.page
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return max(1, min(page_size, self.max_page_size))
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+        try:
+            data = json.loads(base64.urlsafe_b64decode(encoded.encode("ascii")))
+            value = data["v"]
+            if value is not None:
+                value = datetime.fromisoformat(value)
+            return value, int(data["pk"])
+        except (TypeError, ValueError, KeyError, UnicodeEncodeError, binascii.Error):
+            raise NotFound(self.invalid_cursor_message)
+
+    def encode_cursor(self, row):
+        if isinstance(row, dict):
+            # .values() rows
+            value, pk = row[self.keyset_field], row.get("pk", row.get("id"))
+        else:
+            value, pk = getattr(row, self.keyset_field), row.pk
+        data = {"v": value.isoformat() if value is not None else None, "pk": pk}
+        encoded = base64.urlsafe_b64encode(json.dumps(data).encode("ascii"))
+        return encoded.decode("ascii")
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(
+            url, self.cursor_query_param, self.encode_cursor(self.page[-1])
+        )
+
+    def get_paginated_response(self, data):
+        return Response(
+            OrderedDict([("next", self.get_next_link()), ("results", data)])
+        )
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+
+class LimitOffsetOrKeysetPagination(CachedCountLimitOffsetPagination):
+    """
+    `CachedCountLimitOffsetPagination` by default, `KeysetPagination` (no count, constant
+    time pages for infinite scroll) with `?pagination=cursor` or `?cursor=`.
+    """
+
+    mode_query_param = "pagination"
+    keyset_class = KeysetPagination
+
+    def use_keyset(self, request):
+        return (
+            request.query_params.get(self.mode_query_param) == "cursor"
+            or self.keyset_class.cursor_query_param in request.query_params
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.use_keyset(request):
+            self.keyset = self.keyset_class()
+            return self.keyset.paginate_queryset(queryset, request, view)
+        self.keyset = None
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
+        return super().get_paginated_response(data)
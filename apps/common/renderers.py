@@ -0,0 +1,45 @@
+import orjson
+from rest_framework.renderers import JSONRenderer
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    `JSONRenderer` producing the same bytes with orjson.
+
+    Values orjson does not handle the way DRF does (datetimes, dataclasses
+    and everything it can not serialize: Decimal, lazy translation strings,
+    querysets, ...) go through DRF's `encoder_class`. Indented output, ASCII
+    or non-compact settings and values orjson rejects (e.g. integers over
+    64 bits) use `JSONRenderer`. U+2028 / U+2029 are escaped like DRF does.
+
+    One difference: orjson renders NaN and Infinity as null, where
+    `JSONRenderer` (STRICT_JSON) raises ValueError. Finding them would mean
+    walking the whole payload in Python, which costs more than orjson saves,
+    so serializers must not return non-finite floats.
+    """
+
+    options = (
+        orjson.OPT_NON_STR_KEYS
+        | orjson.OPT_PASSTHROUGH_DATETIME
+        | orjson.OPT_PASSTHROUGH_DATACLASS
+    )
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        if indent is not None or self.ensure_ascii or not self.compact:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(
+                data, default=self.encoder_class().default, option=self.options
+            )
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # escaped like JSONRenderer, so the output stays a strict javascript subset
+        return ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(
+            b"\xe2\x80\xa9", b"\\u2029"
+        )
@@ -0,0 +1,16 @@
+import functools
+
+import redis
+from django.conf import settings
+
+
+@functools.lru_cache(maxsize=None)
+def get_redis_client():
+    """Process-wide Redis client (connection pool) for data structures the cache API lacks."""
+    return redis.StrictRedis(
+        host=settings.REDIS_HOST,
+        port=settings.REDIS_PORT,
+        db=settings.REDIS_DB,
+        socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
+        socket_connect_timeout=settings.REDIS_SOCKET_TIMEOUT,
+    )
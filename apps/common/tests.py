@@ -1 +1,99 @@
-# Create your tests here.
+import unittest
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from apps.common.pagination import CachedCountLimitOffsetPagination
+
+User = get_user_model()
+
+
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}},
+    PAGINATION_COUNT_CACHE="default",
+    PAGINATION_COUNT_CACHE_TIMEOUT=60,
+    PAGINATION_COUNT_ESTIMATE_THRESHOLD=10000,
+)
+class CachedCountLimitOffsetPaginationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        for number in range(5):
+            User.objects.create_user(f"foydalanuvchi{number}")
+
+    def setUp(self):
+        cache.clear()
+
+    def paginate(self, **params):
+        paginator = CachedCountLimitOffsetPagination()
+        request = Request(APIRequestFactory().get("/", params))
+        page = paginator.paginate_queryset(User.objects.order_by("pk"), request)
+        return page, paginator.get_paginated_response([user.pk for user in page]).data
+
+    def add_users(self, count):
+        for number in range(count):
+            User.objects.create_user(f"yangi{number}")
+
+    def test_count_is_cached(self):
+        _, data = self.paginate(limit=2)
+        self.assertEqual(data["count"], 5)
+        self.assertFalse(data["count_is_estimate"])
+
+        self.add_users(1)
+        # faqat sahifa so'rovi, COUNT(*) yo'q
+        with self.assertNumQueries(1):
+            _, data = self.paginate(limit=2)
+        self.assertEqual(data["count"], 5)
+        self.assertTrue(data["count_is_estimate"])
+
+    def test_stale_count_does_not_hide_rows(self):
+        self.paginate(limit=2)
+        self.add_users(4)
+
+        # keshdagi 5 dan keyingi sahifalar ham o'qiladi
+        page, data = self.paginate(limit=2, offset=6)
+        self.assertEqual(len(page), 2)
+        self.assertTrue(data["count_is_estimate"])
+        self.assertIn("offset=8", data["next"])
+
+        page, data = self.paginate(limit=2, offset=8)
+        self.assertEqual(len(page), 1)
+        self.assertIsNone(data["next"])
+
+        page, data = self.paginate(limit=2, offset=10)
+        self.assertEqual(page, [])
+        self.assertIsNone(data["next"])
+
+    def test_count_exact(self):
+        self.paginate(limit=2)
+        self.add_users(1)
+
+        _, data = self.paginate(limit=2, count="exact")
+        self.assertEqual(data["count"], 6)
+        self.assertFalse(data["count_is_estimate"])
+        # yangi son keshga yozilgan
+        _, data = self.paginate(limit=2)
+        self.assertEqual(data["count"], 6)
+        self.assertTrue(data["count_is_estimate"])
+
+    def test_zero_count_is_not_cached(self):
+        User.objects.all().delete()
+        _, data = self.paginate(limit=2)
+        self.assertEqual(data["count"], 0)
+
+        self.add_users(1)
+        page, data = self.paginate(limit=2)
+        self.assertEqual(data["count"], 1)
+        self.assertFalse(data["count_is_estimate"])
+        self.assertEqual(len(page), 1)
+
+    @unittest.skipUnless(connection.vendor == "postgresql", "EXPLAIN estimate")
+    def test_planner_estimate(self):
+        with override_settings(PAGINATION_COUNT_ESTIMATE_THRESHOLD=1):
+            page, data = self.paginate(limit=2, offset=4)
+        self.assertTrue(data["count_is_estimate"])
+        self.assertEqual(len(page), 1)
+        self.assertIsNone(data["next"])
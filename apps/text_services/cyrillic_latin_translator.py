@@ -1,5 +1,8 @@
+import functools
 import re
 
+from .trie import WordTrie
+
 LATIN_TO_CYRILLIC = {
     "a": "а",
     "A": "А",
@@ -1283,93 +1286,150 @@ CYRILLIC_VOWELS = (
 )
 
 
+# These compounds must be converted before other letters
+CYRILLIC_COMPOUNDS_FIRST = {
+    "ch": "ч",
+    "Ch": "Ч",
+    "CH": "Ч",
+    # this line must come before 's' because it has an 'h'
+    "sh": "ш",
+    "Sh": "Ш",
+    "SH": "Ш",
+    # This line must come before 'yo' because of it's apostrophe
+    "yo‘": "йў",
+    "Yo‘": "Йў",
+    "YO‘": "ЙЎ",
+}
+CYRILLIC_COMPOUNDS_SECOND = {
+    "yo": "ё",
+    "Yo": "Ё",
+    "YO": "Ё",
+    # 'ts': 'ц', 'Ts': 'Ц', 'TS': 'Ц',  # No need for this, see TS_WORDS
+    "yu": "ю",
+    "Yu": "Ю",
+    "YU": "Ю",
+    "ya": "я",
+    "Ya": "Я",
+    "YA": "Я",
+    "ye": "е",
+    "Ye": "Е",
+    "YE": "Е",
+    # different kinds of apostrophes
+    "o‘": "ў",
+    "O‘": "Ў",
+    "oʻ": "ў",
+    "Oʻ": "Ў",
+    "g‘": "ғ",
+    "G‘": "Ғ",
+    "gʻ": "ғ",
+    "Gʻ": "Ғ",
+}
+CYRILLIC_BEGINNING_RULES = {
+    "ye": "е",
+    "Ye": "Е",
+    "YE": "Е",
+    "e": "э",
+    "E": "Э",
+}
+CYRILLIC_AFTER_VOWEL_RULES = {
+    "ye": "е",
+    "Ye": "Е",
+    "YE": "Е",
+    "e": "э",
+    "E": "Э",
+}
+EXCEPTION_WORDS_RULES = {
+    "s": "ц",
+    "S": "Ц",
+    "ts": "ц",
+    "Ts": "Ц",
+    "TS": "Ц",  # but not tS
+    "e": "э",
+    "E": "э",
+    "sh": "сҳ",
+    "Sh": "Сҳ",
+    "SH": "СҲ",
+    "yo": "йо",
+    "Yo": "Йо",
+    "YO": "ЙО",
+    "yu": "йу",
+    "Yu": "Йу",
+    "YU": "ЙУ",
+    "ya": "йа",
+    "Ya": "Йа",
+    "YA": "ЙА",
+}
+
+
+def _alternation(words):
+    return "|".join(re.escape(word) for word in words)
+
+
+# Every LATIN_TO_CYRILLIC and CYRILLIC_TO_LATIN key is a single character, so
+# the last step of both converters is a plain str.translate; the regex rules
+# above handle everything that depends on context.
+LATIN_TO_CYRILLIC_TABLE = str.maketrans(LATIN_TO_CYRILLIC)
+CYRILLIC_TO_LATIN_TABLE = str.maketrans(CYRILLIC_TO_LATIN)
+
+
+@functools.lru_cache(maxsize=None)
+def _soft_sign_words_trie():
+    return WordTrie(SOFT_SIGN_WORDS)
+
+
+@functools.lru_cache(maxsize=None)
+def _exception_words_trie():
+    """
+    Build a single trie from TS_WORDS and E_WORDS.
+
+    Every matchable word (the key without parentheses) maps to the span of
+    its first parenthesized part, which is the only part that gets replaced.
+    """
+    spans = {}
+    for word in list(TS_WORDS.keys()) + list(E_WORDS.keys()):
+        start = word.index("(")
+        end = word.index(")") - 1
+        spans.setdefault(word.replace("(", "").replace(")", ""), (start, end))
+    return WordTrie(spans)
+
+
+@functools.lru_cache(maxsize=None)
+def _to_cyrillic_rules():
+    return (
+        re.compile(r"(%s)" % _alternation(CYRILLIC_COMPOUNDS_FIRST), flags=re.U),
+        re.compile(r"(%s)" % _alternation(CYRILLIC_COMPOUNDS_SECOND), flags=re.U),
+        re.compile(r"\b(%s)" % _alternation(CYRILLIC_BEGINNING_RULES), flags=re.U),
+        re.compile(
+            r"({})({})".format(
+                _alternation(LATIN_VOWELS), _alternation(CYRILLIC_AFTER_VOWEL_RULES)
+            ),
+            flags=re.U,
+        ),
+    )
+
+
 def to_cyrillic(text):
     """Transliterate latin text to cyrillic  using the following rules:
     1. ye = е in the beginning of a word or after a vowel
     2. e = э in the beginning of a word or after a vowel
     3. ц exception words
     4. э exception words
+
+    Exception words are found with one trie scan per dictionary, so the cost
+    of a conversion does not depend on dictionary size.
     """
-    # These compounds must be converted before other letters
-    compounds_first = {
-        "ch": "ч",
-        "Ch": "Ч",
-        "CH": "Ч",
-        # this line must come before 's' because it has an 'h'
-        "sh": "ш",
-        "Sh": "Ш",
-        "SH": "Ш",
-        # This line must come before 'yo' because of it's apostrophe
-        "yo‘": "йў",
-        "Yo‘": "Йў",
-        "YO‘": "ЙЎ",
-    }
-    compounds_second = {
-        "yo": "ё",
-        "Yo": "Ё",
-        "YO": "Ё",
-        # 'ts': 'ц', 'Ts': 'Ц', 'TS': 'Ц',  # No need for this, see TS_WORDS
-        "yu": "ю",
-        "Yu": "Ю",
-        "YU": "Ю",
-        "ya": "я",
-        "Ya": "Я",
-        "YA": "Я",
-        "ye": "е",
-        "Ye": "Е",
-        "YE": "Е",
-        # different kinds of apostrophes
-        "o‘": "ў",
-        "O‘": "Ў",
-        "oʻ": "ў",
-        "Oʻ": "Ў",
-        "g‘": "ғ",
-        "G‘": "Ғ",
-        "gʻ": "ғ",
-        "Gʻ": "Ғ",
-    }
-    beginning_rules = {
-        "ye": "е",
-        "Ye": "Е",
-        "YE": "Е",
-        "e": "э",
-        "E": "Э",
-    }
-    after_vowel_rules = {
-        "ye": "е",
-        "Ye": "Е",
-        "YE": "Е",
-        "e": "э",
-        "E": "Э",
-    }
-    exception_words_rules = {
-        "s": "ц",
-        "S": "Ц",
-        "ts": "ц",
-        "Ts": "Ц",
-        "TS": "Ц",  # but not tS
-        "e": "э",
-        "E": "э",
-        "sh": "сҳ",
-        "Sh": "Сҳ",
-        "SH": "СҲ",
-        "yo": "йо",
-        "Yo": "Йо",
-        "YO": "ЙО",
-        "yu": "йу",
-        "Yu": "Йу",
-        "YU": "ЙУ",
-        "ya": "йа",
-        "Ya": "Йа",
-        "YA": "ЙА",
-    }
+    (
+        compounds_first_re,
+        compounds_second_re,
+        beginning_re,
+        after_vowel_re,
+    ) = _to_cyrillic_rules()
 
     # standardize some characters
     # the first one is the windows string, the second one is the mac string
     text = text.replace("ʻ", "‘")
 
-    def replace_soft_sign_words(m):
-        word = m.group(1)
+    def replace_soft_sign_words(word, cyrillic):
         if word.isupper():
             result = SOFT_SIGN_WORDS[word.lower()].upper()
         elif word[0].isupper():
@@ -1379,60 +1439,54 @@ def to_cyrillic(text):
             result = SOFT_SIGN_WORDS[word.lower()]
         return result
 
-    for word in SOFT_SIGN_WORDS:
-        text = re.sub(r"\b(%s)" % word, replace_soft_sign_words, text, flags=re.U)
+    text = _soft_sign_words_trie().sub(replace_soft_sign_words, text)
 
-    def replace_exception_words(m):
+    def replace_exception_words(word, span):
         """Replace ц (or э) only leaving other characters unchanged"""
+        start, end = span
         return "{}{}{}".format(
-            m.group(1)[: m.start(2)],
-            exception_words_rules[m.group(2)],
-            m.group(1)[m.end(2) :],
+            word[:start],
+            EXCEPTION_WORDS_RULES[word[start:end]],
+            word[end:],
         )
 
-    # loop because of python's limit of 100 named groups
-    for word in list(TS_WORDS.keys()) + list(E_WORDS.keys()):
-        text = re.sub(r"\b(%s)" % word, replace_exception_words, text, flags=re.U)
+    text = _exception_words_trie().sub(replace_exception_words, text)
 
     # compounds
-    text = re.sub(
-        r"(%s)" % "|".join(compounds_first.keys()),
-        lambda x: compounds_first[x.group(1)],
-        text,
-        flags=re.U,
+    text = compounds_first_re.sub(lambda x: CYRILLIC_COMPOUNDS_FIRST[x.group(1)], text)
+    text = compounds_second_re.sub(
+        lambda x: CYRILLIC_COMPOUNDS_SECOND[x.group(1)], text
     )
 
-    text = re.sub(
-        r"(%s)" % "|".join(compounds_second.keys()),
-        lambda x: compounds_second[x.group(1)],
-        text,
-        flags=re.U,
-    )
+    text = beginning_re.sub(lambda x: CYRILLIC_BEGINNING_RULES[x.group(1)], text)
 
-    text = re.sub(
-        r"\b(%s)" % "|".join(beginning_rules.keys()),
-        lambda x: beginning_rules[x.group(1)],
-        text,
-        flags=re.U,
+    text = after_vowel_re.sub(
+        lambda x: f"{x.group(1)}{CYRILLIC_AFTER_VOWEL_RULES[x.group(2)]}", text
     )
 
-    text = re.sub(
-        r"({})({})".format("|".join(LATIN_VOWELS), "|".join(after_vowel_rules.keys())),
-        lambda x: f"{x.group(1)}{after_vowel_rules[x.group(2)]}",
-        text,
-        flags=re.U,
-    )
-
-    text = re.sub(
-        r"(%s)" % "|".join(LATIN_TO_CYRILLIC.keys()),
-        lambda x: LATIN_TO_CYRILLIC[x.group(1)],
-        text,
-        flags=re.U,
-    )
+    text = text.translate(LATIN_TO_CYRILLIC_TABLE)
 
     return text
 
 
+LATIN_BEGINNING_RULES = {"ц": "s", "Ц": "S", "е": "ye", "Е": "Ye"}
+LATIN_AFTER_VOWEL_RULES = {"ц": "ts", "Ц": "Ts", "е": "ye", "Е": "Ye"}
+
+
+@functools.lru_cache(maxsize=None)
+def _to_latin_rules():
+    return (
+        re.compile(r"(сент|окт)([яЯ])(бр)", flags=re.IGNORECASE | re.U),
+        re.compile(r"\b(%s)" % _alternation(LATIN_BEGINNING_RULES), flags=re.U),
+        re.compile(
+            r"({})({})".format(
+                _alternation(CYRILLIC_VOWELS), _alternation(LATIN_AFTER_VOWEL_RULES)
+            ),
+            flags=re.U,
+        ),
+    )
+
+
 def to_latin(text):
     """Transliterate cyrillic text to latin using the following rules:
     1. ц = s at the beginning of a word.
@@ -1446,40 +1500,22 @@ def to_latin(text):
     е = e in the middle of a word after a consonant (DEFAULT).
     3. Сентябр = Sentabr, Октябр = Oktabr
     """
-    beginning_rules = {"ц": "s", "Ц": "S", "е": "ye", "Е": "Ye"}
-    after_vowel_rules = {"ц": "ts", "Ц": "Ts", "е": "ye", "Е": "Ye"}
+    months_re, beginning_re, after_vowel_re = _to_latin_rules()
 
-    text = re.sub(
-        r"(сент|окт)([яЯ])(бр)",
+    text = months_re.sub(
         lambda x: "{}{}{}".format(
             x.group(1), "a" if x.group(2) == "я" else "A", x.group(3)
         ),
         text,
-        flags=re.IGNORECASE | re.U,
     )
 
-    text = re.sub(
-        r"\b(%s)" % "|".join(beginning_rules.keys()),
-        lambda x: beginning_rules[x.group(1)],
-        text,
-        flags=re.U,
-    )
+    text = beginning_re.sub(lambda x: LATIN_BEGINNING_RULES[x.group(1)], text)
 
-    text = re.sub(
-        r"({})({})".format(
-            "|".join(CYRILLIC_VOWELS), "|".join(after_vowel_rules.keys())
-        ),
-        lambda x: f"{x.group(1)}{after_vowel_rules[x.group(2)]}",
-        text,
-        flags=re.U,
+    text = after_vowel_re.sub(
+        lambda x: f"{x.group(1)}{LATIN_AFTER_VOWEL_RULES[x.group(2)]}", text
     )
 
-    text = re.sub(
-        r"(%s)" % "|".join(CYRILLIC_TO_LATIN.keys()),
-        lambda x: CYRILLIC_TO_LATIN[x.group(1)],
-        text,
-        flags=re.U,
-    )
+    text = text.translate(CYRILLIC_TO_LATIN_TABLE)
 
     return text
 
@@ -1488,10 +1524,95 @@ CYRILLIC = "cyrillic"
 LATIN = "latin"
 
 
+# Characters that any to_cyrillic / to_latin rule needs in order to change text.
+LATIN_CHARS_RE = re.compile(
+    "[%s]" % re.escape("".join(LATIN_TO_CYRILLIC.keys()) + "ʻ"), flags=re.U
+)
+CYRILLIC_CHARS_RE = re.compile(
+    "[%s]" % re.escape("".join(CYRILLIC_TO_LATIN.keys())), flags=re.U
+)
+
+
+def has_latin(text):
+    """Whether `to_cyrillic` would change anything in `text`."""
+    return LATIN_CHARS_RE.search(text) is not None
+
+
+def has_cyrillic(text):
+    """Whether `to_latin` would change anything in `text`."""
+    return CYRILLIC_CHARS_RE.search(text) is not None
+
+
 def transliterate(text, to_variant):
+    """
+    Convert `text` to `to_variant`.
+    Text without characters of the source script is returned unchanged
+    without running the rules.
+    """
     if to_variant == CYRILLIC:
-        text = to_cyrillic(text)
+        if has_latin(text):
+            text = to_cyrillic(text)
     elif to_variant == LATIN:
-        text = to_latin(text)
+        if has_cyrillic(text):
+            text = to_latin(text)
 
     return text
+
+
+# Apostrophes used in o‘, g‘ and the tutuq belgisi, typed in many ways
+APOSTROPHES = "‘’ʻʼ`'"
+APOSTROPHES_RE = re.compile("[%s]" % APOSTROPHES, flags=re.U)
+
+
+def normalize_latin(text):
+    """Lower case `text` and replace every apostrophe variant with '."""
+    return APOSTROPHES_RE.sub("'", text).lower()
+
+
+def fold(text):
+    """
+    Script-folded form of `text` for search: converted to latin and normalized,
+    so the same word written in either script folds to the same string.
+    """
+    return normalize_latin(transliterate(text, LATIN))
+
+
+# No rule matches across whitespace, so text can be converted piece by piece
+# as long as every piece ends with a whitespace character.
+STREAM_CHUNK_SIZE = 64 * 1024
+# Text without whitespace longer than this is converted as is to keep memory flat
+STREAM_MAX_CARRY = 64 * 1024
+
+
+def _split_after_last_space(text):
+    for i in range(len(text) - 1, -1, -1):
+        if text[i].isspace():
+            return text[: i + 1], text[i + 1 :]
+    return "", text
+
+
+def transliterate_chunks(chunks, to_variant, max_carry=STREAM_MAX_CARRY):
+    """
+    Convert an iterable of text chunks to `to_variant`, yielding converted chunks.
+
+    The unfinished word at the end of every chunk is carried over to the next
+    one, so words and compounds ("yo‘", "sh", "ch") split between chunks are
+    converted the same way as by `transliterate` on the joined text.
+    """
+    carry = ""
+    for chunk in chunks:
+        if not chunk:
+            continue
+        buffer = carry + chunk
+        head, carry = _split_after_last_space(buffer)
+        if len(carry) > max_carry:
+            head, carry = buffer, ""
+        if head:
+            yield transliterate(head, to_variant)
+    if carry:
+        yield transliterate(carry, to_variant)
+
+
+def transliterate_file(file, to_variant, chunk_size=STREAM_CHUNK_SIZE):
+    """Convert a text-mode file-like object, yielding converted chunks."""
+    return transliterate_chunks(iter(lambda: file.read(chunk_size), ""), to_variant)
@@ -0,0 +1,24 @@
+from django.db.models import Func, TextField, Value
+from django.db.models.functions import Replace
+
+from .cyrillic_latin_translator import APOSTROPHES
+
+
+class StripApostrophes(Func):
+    """
+    Remove every apostrophe variant, so o‘zbek, oʻzbek and o'zbek compare equal.
+    Used in expression indexes, so the SQL must stay the same for equal input.
+    """
+
+    function = "translate"
+    output_field = TextField()
+
+    def __init__(self, expression, **extra):
+        super().__init__(expression, Value(APOSTROPHES), Value(""), **extra)
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        expression = self.source_expressions[0]
+        for apostrophe in APOSTROPHES:
+            expression = Replace(expression, Value(apostrophe), Value(""))
+        return compiler.compile(expression)
+
@@ -1,34 +1,293 @@
 import operator
+import re
 from functools import reduce
 from typing import List
 
 from django.conf import settings
-from django.db.models import Q
+from django.contrib.postgres.lookups import TrigramWordSimilar
+from django.contrib.postgres.search import TrigramWordSimilarity
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db import connections, transaction
+from django.db.models import Case, Exists, F, OuterRef, Q, Value, When
 from rest_framework.filters import SearchFilter
+from rest_framework.settings import api_settings
 
 from apps.text_services import cyrillic_latin_translator
-from apps.text_services.q_processors import QLatinCyrillicProcessor
+from apps.text_services.expressions import StripApostrophes
+from apps.text_services.q_processors import QFoldProcessor, QLatinCyrillicProcessor
+from apps.text_services.search_cache import SearchResultCache
 
 
-def distinct(queryset, base):
-    if settings.DATABASES[queryset.db]["ENGINE"] == "django.db.backends.oracle":
-        # distinct analogue for Oracle users
-        return base.filter(pk__in=set(queryset.values_list('pk', flat=True)))
-    return queryset.distinct()
+SEARCH_BACKEND_CONTAINS = "contains"
+SEARCH_BACKEND_FULLTEXT = "fulltext"
+SEARCH_BACKEND_TRIGRAM = "trigram"
 
 
 class MultiSymbolSearchFilter(SearchFilter):
+    """
+    Search in both scripts.
+
+    The backend is taken from the view's `search_backend` or
+    `settings.SEARCH_BACKEND`:
+
+    * "fulltext": PostgreSQL full-text search over the view's
+      `search_vector_field` (a stored tsvector of the script-folded text),
+      ranked with `SearchRank` unless the client asked for an ordering.
+      On other databases, or without `search_vector_field`, "contains" is used.
+    * "trigram": typo tolerant PostgreSQL pg_trgm word similarity of the
+      query (both scripts, apostrophes removed) against the view's
+      `search_trigram_fields`, using `pg_trgm.word_similarity_threshold` =
+      `search_trigram_threshold` / `settings.SEARCH_TRIGRAM_THRESHOLD`.
+      The fields need GIN trigram indexes on `StripApostrophes(field)`; the
+      matching primary keys are collected with one query per index, combined
+      with UNION, and at most `settings.SEARCH_TRIGRAM_MAX_RESULTS` of the
+      most similar are kept. Falls back like "fulltext".
+    * "contains": if the view sets `search_document_field` (a column holding
+      the script-folded text of its `search_fields`, see
+      `cyrillic_latin_translator.fold`) the query is folded once and matched
+      against that single column. Otherwise every term is matched against
+      `search_fields` in its latin and cyrillic forms.
+
+    If the document (and its tsvector) holds only some of the `search_fields`
+    (the view's `search_document_sources`), a term matching one of the others,
+    e.g. a tag name, in its latin or cyrillic form is a match as well, for
+    "contains" and "fulltext" alike.
+
+    Lookups crossing a many-to-many relation are correlated `Exists`
+    subqueries (see `field_condition`), so the filtered query never returns
+    an object twice and never needs DISTINCT.
+
+    If the view sets `search_cache_version_key`, the matching primary keys
+    are cached (see `SearchResultCache`) under the folded terms, the backend,
+    the ordering and the view's filter parameters (`search_cache_params`,
+    by default the fields of its `filterset_class`), and repeated searches
+    become a `pk__in` lookup. Bump the version when the searched data changes.
+    """
+
+    def get_search_backend(self, view, request):
+        return getattr(view, "search_backend", settings.SEARCH_BACKEND)
+
+    def get_search_document_field(self, view, request):
+        return getattr(view, "search_document_field", None)
+
+    def get_search_document_sources(self, view, request):
+        return getattr(view, "search_document_sources", None)
+
+    def get_search_vector_field(self, view, request):
+        return getattr(view, "search_vector_field", None)
+
+    def get_search_trigram_fields(self, view, request):
+        return getattr(view, "search_trigram_fields", None)
+
+    def get_search_trigram_threshold(self, view, request):
+        return getattr(
+            view, "search_trigram_threshold", settings.SEARCH_TRIGRAM_THRESHOLD
+        )
+
+    def get_search_cache(self, view, request):
+        version_key = getattr(view, "search_cache_version_key", None)
+        if not version_key:
+            return None
+        result_cache = SearchResultCache(version_key)
+        return result_cache if result_cache.enabled else None
+
+    def get_search_cache_params(self, view, request):
+        params = getattr(view, "search_cache_params", None)
+        if params is not None:
+            return params
+        filterset_class = getattr(view, "filterset_class", None)
+        return list(filterset_class.base_filters) if filterset_class else []
+
+    def get_search_cache_key_parts(self, request, view, search_terms) -> dict:
+        params = request.query_params
+        return {
+            "view": f"{view.__class__.__module__}.{view.__class__.__qualname__}",
+            "backend": self.get_search_backend(view, request),
+            "terms": QFoldProcessor().process(" ".join(search_terms)).split(),
+            "ordering": params.get(api_settings.ORDERING_PARAM, ""),
+            "filters": {
+                name: params.getlist(name)
+                for name in sorted(self.get_search_cache_params(view, request))
+                if name in params
+            },
+        }
+
+    @staticmethod
+    def filter_cached(queryset, cached):
+        queryset = queryset.filter(pk__in=cached["pks"])
+        if cached["ranked"]:
+            # keep the search_rank order the ids were stored in
+            queryset = queryset.order_by(
+                Case(
+                    *[When(pk=pk, then=Value(i)) for i, pk in enumerate(cached["pks"])]
+                )
+            )
+        return queryset
+
     @staticmethod
     def process_terms(
-            processor: QLatinCyrillicProcessor, terms: List[str], orm_lookups: List[str]
-    ) -> List[Q]:
+        processor: QLatinCyrillicProcessor, terms: List[str]
+    ) -> List[str]:
         joined_terms = " ".join(terms)
-        processed_terms = processor.process(joined_terms).split(" ")
+        return processor.process(joined_terms).split(" ")
+
+    def field_condition(self, queryset, field, condition) -> Q:
+        """
+        `condition` on `field`; many-to-many paths become a correlated subquery
+        instead of a join that multiplies rows of `queryset.model`.
+        """
+        if not self.must_call_distinct(queryset, [field]):
+            return Q(condition)
+        subquery = queryset.model._default_manager.filter(condition, pk=OuterRef("pk"))
+        return Q(Exists(subquery))
+
+    def build_conditions(self, queryset, terms: List[str], lookups) -> Q:
+        """
+        Every term must be found in at least one of the fields.
+        `lookups` are `(search_field, orm_lookup)` pairs.
+        """
+        return reduce(
+            operator.and_,
+            [
+                reduce(
+                    operator.or_,
+                    [
+                        self.field_condition(
+                            queryset, search_field, Q(**{orm_lookup: term})
+                        )
+                        for search_field, orm_lookup in lookups
+                    ],
+                )
+                for term in terms
+            ],
+        )
+
+    def outside_document_lookups(self, queryset, search_fields, document_sources):
+        """`(search_field, orm_lookup)` of the `search_fields` the document lacks."""
+        if document_sources is None:
+            return []
         return [
-            Q(**{orm_lookup: term})
-            for term in processed_terms
-            for orm_lookup in orm_lookups
+            (search_field, self.construct_search(str(search_field), queryset))
+            for search_field in search_fields
+            if search_field not in document_sources
+        ]
+
+    def outside_document_condition(self, queryset, search_terms, lookups):
+        """
+        All `search_terms`, each in its latin or cyrillic form, found in the
+        fields of `lookups`; None without lookups.
+        """
+        if not lookups:
+            return None
+        latin_terms = self.process_terms(
+            QLatinCyrillicProcessor(cyrillic_latin_translator.LATIN), search_terms
+        )
+        cyrillic_terms = self.process_terms(
+            QLatinCyrillicProcessor(cyrillic_latin_translator.CYRILLIC), search_terms
+        )
+        conditions = self.build_conditions(queryset, latin_terms, lookups)
+        if cyrillic_terms != latin_terms:
+            conditions |= self.build_conditions(queryset, cyrillic_terms, lookups)
+        return conditions
+
+    def filter_search_document(
+        self, queryset, search_terms, document_field, outside_lookups=()
+    ):
+        # The column is already lower case, so a case sensitive `contains`
+        # (LIKE) is enough and can use the trigram index of the column.
+        # Like the per-field path, every term must be found in the document
+        # or in one of the fields outside it.
+        fold_processor = QFoldProcessor()
+        conditions = []
+        for term in search_terms:
+            words = fold_processor.process(term).split()
+            if not words:
+                continue
+            condition = reduce(
+                operator.and_,
+                [Q(**{f"{document_field}__contains": word}) for word in words],
+            )
+            if outside_lookups:
+                condition |= self.outside_document_condition(
+                    queryset, [term], outside_lookups
+                )
+            conditions.append(condition)
+        if not conditions:
+            return queryset
+        return queryset.filter(reduce(operator.and_, conditions))
+
+    def filter_fulltext(
+        self, request, queryset, search_terms, vector_field, outside_condition=None
+    ):
+        # only word characters, so the raw tsquery can not be malformed;
+        # ":*" makes every word a prefix, like `contains` does for the tail
+        words = re.findall(
+            r"\w+", QFoldProcessor().process(" ".join(search_terms)), flags=re.U
+        )
+        if not words:
+            return queryset
+        query = SearchQuery(
+            " & ".join(f"{word}:*" for word in words),
+            search_type="raw",
+            config="simple",
+        )
+        condition = Q(**{vector_field: query})
+        if outside_condition is not None:
+            condition |= outside_condition
+        queryset = queryset.filter(condition).annotate(
+            search_rank=SearchRank(F(vector_field), query)
+        )
+        if not request.query_params.get(api_settings.ORDERING_PARAM):
+            ordering = queryset.query.order_by or queryset.model._meta.ordering
+            queryset = queryset.order_by("-search_rank", *ordering)
+        return queryset
+
+    def trigram_branch(self, queryset, field, text):
+        """
+        `(pk, similarity)` of the objects whose `field` matches `text`
+        (`field %> text`), with the indexed expression on the left so that
+        the trigram index of `field` is used. One branch per index, see
+        `filter_trigram`.
+        """
+        expression = StripApostrophes(field)
+        return (
+            queryset.prefetch_related(None)
+            .filter(TrigramWordSimilar(expression, Value(text)))
+            .annotate(trigram_similarity=TrigramWordSimilarity(Value(text), expression))
+            .order_by()
+            .values_list("pk", "trigram_similarity")
+        )
+
+    def filter_trigram(self, queryset, search_terms, trigram_fields, threshold):
+        query = " ".join(search_terms)
+        variants = {
+            cyrillic_latin_translator.APOSTROPHES_RE.sub(
+                "", QLatinCyrillicProcessor(to).process(query)
+            )
+            for to in (
+                cyrillic_latin_translator.LATIN,
+                cyrillic_latin_translator.CYRILLIC,
+            )
+        }
+        # UNION of one index-backed query per field and variant: an OR of
+        # them (and of subqueries over related tables) can't use the
+        # indexes and scans the whole table
+        branches = [
+            self.trigram_branch(queryset, field, variant)
+            for field in trigram_fields
+            for variant in sorted(variants)
         ]
+        matches = branches[0].union(*branches[1:]).order_by("-trigram_similarity")
+        # `%>` uses pg_trgm.word_similarity_threshold, which is set local to
+        # the transaction the matches are read in
+        with transaction.atomic(using=queryset.db):
+            with connections[queryset.db].cursor() as cursor:
+                cursor.execute(
+                    "SELECT set_config('pg_trgm.word_similarity_threshold', %s, true)",
+                    [str(threshold)],
+                )
+            rows = list(matches[: settings.SEARCH_TRIGRAM_MAX_RESULTS])
+        return queryset.filter(pk__in={pk for pk, _ in rows})
 
     def filter_queryset(self, request, queryset, view):
         search_fields = self.get_search_fields(view, request)
@@ -37,27 +296,78 @@ class MultiSymbolSearchFilter(SearchFilter):
         if not search_fields or not search_terms:
             return queryset
 
-        latin_processor = QLatinCyrillicProcessor(cyrillic_latin_translator.LATIN)
-        cyrillic_processor = QLatinCyrillicProcessor(cyrillic_latin_translator.CYRILLIC)
+        result_cache = self.get_search_cache(view, request)
+        version = result_cache.get_version() if result_cache else None
+        if version is None:
+            return self.search_queryset(
+                request, queryset, view, search_fields, search_terms
+            )
 
-        orm_lookups = [
-            self.construct_search(str(search_field)) for search_field in search_fields
-        ]
-        base = queryset
-        latin_conditions = self.process_terms(
-            latin_processor, search_terms, orm_lookups
-        )
-        cyrillic_conditions = self.process_terms(
-            cyrillic_processor, search_terms, orm_lookups
+        key = result_cache.make_key(
+            version, self.get_search_cache_key_parts(request, view, search_terms)
         )
+        cached = result_cache.get(key)
+        if cached is None:
+            result = self.search_queryset(
+                request, queryset, view, search_fields, search_terms
+            )
+            pks = list(
+                result.values_list("pk", flat=True)[: result_cache.max_results + 1]
+            )
+            if len(pks) > result_cache.max_results:
+                return result
+            cached = {"pks": pks, "ranked": "search_rank" in result.query.annotations}
+            result_cache.set(key, cached)
+        return self.filter_cached(queryset, cached)
 
-        combined_latin_conditions = reduce(operator.and_, latin_conditions)
-        combined_cyrillic_conditions = reduce(operator.and_, cyrillic_conditions)
+    def search_queryset(self, request, queryset, view, search_fields, search_terms):
+        backend = self.get_search_backend(view, request)
+        is_postgresql = connections[queryset.db].vendor == "postgresql"
 
-        queryset = queryset.filter(
-            Q(combined_latin_conditions) | Q(combined_cyrillic_conditions)
+        outside_lookups = self.outside_document_lookups(
+            queryset, search_fields, self.get_search_document_sources(view, request)
         )
-        if self.must_call_distinct(queryset, search_fields):
-            queryset = distinct(queryset, base)
 
-        return queryset
+        vector_field = self.get_search_vector_field(view, request)
+        if backend == SEARCH_BACKEND_FULLTEXT and vector_field and is_postgresql:
+            return self.filter_fulltext(
+                request,
+                queryset,
+                search_terms,
+                vector_field,
+                self.outside_document_condition(
+                    queryset, search_terms, outside_lookups
+                ),
+            )
+
+        trigram_fields = self.get_search_trigram_fields(view, request)
+        if backend == SEARCH_BACKEND_TRIGRAM and trigram_fields and is_postgresql:
+            return self.filter_trigram(
+                queryset,
+                search_terms,
+                trigram_fields,
+                self.get_search_trigram_threshold(view, request),
+            )
+
+        document_field = self.get_search_document_field(view, request)
+        if document_field:
+            return self.filter_search_document(
+                queryset, search_terms, document_field, outside_lookups
+            )
+
+        latin_processor = QLatinCyrillicProcessor(cyrillic_latin_translator.LATIN)
+        cyrillic_processor = QLatinCyrillicProcessor(cyrillic_latin_translator.CYRILLIC)
+
+        lookups = [
+            (search_field, self.construct_search(str(search_field), queryset))
+            for search_field in search_fields
+        ]
+        latin_terms = self.process_terms(latin_processor, search_terms)
+        cyrillic_terms = self.process_terms(cyrillic_processor, search_terms)
+
+        conditions = self.build_conditions(queryset, latin_terms, lookups)
+        # digits, slugs etc. look the same in both scripts, one branch is enough
+        if cyrillic_terms != latin_terms:
+            conditions |= self.build_conditions(queryset, cyrillic_terms, lookups)
+
+        return queryset.filter(conditions)
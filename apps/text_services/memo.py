@@ -0,0 +1,139 @@
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+
+from django.core.cache import caches
+
+from . import cyrillic_latin_translator
+
+logger = logging.getLogger(__name__)
+
+
+class LRUCache:
+    """
+    Size-bounded, thread-safe least-recently-used mapping.
+    Keeps hit / miss / eviction counters, see `stats`.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+class TransliterationCache:
+    """
+    Memoize `cyrillic_latin_translator.transliterate` for short texts
+    (search terms).
+
+    Lookups go to a per-process `LRUCache` first and then, if
+    `shared_cache_alias` is set, to that Django cache (Redis), so gunicorn
+    workers share warm entries. Errors of the shared tier are logged and
+    treated as misses.
+    """
+
+    key_prefix = "transliteration"
+
+    def __init__(
+        self,
+        maxsize: int,
+        max_length: int = 256,
+        shared_cache_alias: str = "",
+        shared_timeout: int = 60 * 60 * 24,
+    ):
+        self.local = LRUCache(maxsize)
+        self.max_length = max_length
+        self.shared_cache_alias = shared_cache_alias
+        self.shared_timeout = shared_timeout
+        self.shared_hits = 0
+        self._lock = threading.Lock()
+
+    def make_shared_key(self, text: str, to_variant: str) -> str:
+        digest = hashlib.sha1(text.encode("utf-8")).hexdigest()
+        return f"{self.key_prefix}:{to_variant}:{digest}"
+
+    def transliterate(self, text: str, to_variant: str) -> str:
+        if len(text) > self.max_length:
+            return cyrillic_latin_translator.transliterate(text, to_variant)
+
+        key = (to_variant, text)
+        result = self.local.get(key)
+        if result is not None:
+            return result
+
+        if self.shared_cache_alias:
+            shared_key = self.make_shared_key(text, to_variant)
+            result = self._shared_get(shared_key)
+            if result is not None:
+                with self._lock:
+                    self.shared_hits += 1
+                self.local.set(key, result)
+                return result
+
+        result = cyrillic_latin_translator.transliterate(text, to_variant)
+        self.local.set(key, result)
+        if self.shared_cache_alias:
+            self._shared_set(shared_key, result)
+        return result
+
+    def _shared_get(self, key):
+        try:
+            return caches[self.shared_cache_alias].get(key)
+        except Exception:
+            logger.warning("Transliteration shared cache get failed", exc_info=True)
+            return None
+
+    def _shared_set(self, key, value):
+        try:
+            caches[self.shared_cache_alias].set(key, value, self.shared_timeout)
+        except Exception:
+            logger.warning("Transliteration shared cache set failed", exc_info=True)
+
+    def stats(self) -> dict:
+        return {**self.local.stats(), "shared_hits": self.shared_hits}
+
+    def clear(self):
+        self.local.clear()
+        self.shared_hits = 0
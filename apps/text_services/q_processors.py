@@ -1,6 +1,20 @@
+import functools
 from abc import ABC, abstractmethod
 
+from django.conf import settings
+
 from . import cyrillic_latin_translator
+from .memo import TransliterationCache
+
+
+@functools.lru_cache(maxsize=None)
+def get_transliteration_cache() -> TransliterationCache:
+    """Process-wide memo used by `QLatinCyrillicProcessor`, see `stats()`."""
+    return TransliterationCache(
+        maxsize=settings.TRANSLITERATION_CACHE_SIZE,
+        max_length=settings.TRANSLITERATION_CACHE_MAX_LENGTH,
+        shared_cache_alias=settings.TRANSLITERATION_SHARED_CACHE,
+    )
 
 
 class QProcessorBase(ABC):
@@ -17,10 +31,23 @@ class QProcessorBase(ABC):
 class QLatinCyrillicProcessor(QProcessorBase):
     """
     Convert `text` to latin or cyrillic characters depending on which characters are used in `text`.
+    Results are memoized, see `get_transliteration_cache`.
     """
 
     def __init__(self, to):
         self.to = to
 
     def process(self, text: str) -> str:
-        return cyrillic_latin_translator.transliterate(text, self.to)
+        return get_transliteration_cache().transliterate(text, self.to)
+
+
+class QFoldProcessor(QProcessorBase):
+    """
+    Convert `text` to its script-folded form, see `cyrillic_latin_translator.fold`.
+    """
+
+    def process(self, text: str) -> str:
+        latin = get_transliteration_cache().transliterate(
+            text, cyrillic_latin_translator.LATIN
+        )
+        return cyrillic_latin_translator.normalize_latin(latin)
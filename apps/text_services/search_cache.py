@@ -0,0 +1,88 @@
+import hashlib
+import json
+import logging
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+
+logger = logging.getLogger(__name__)
+
+
+class SearchResultCache:
+    """
+    Cache of search results as ordered primary key lists, used by
+    `MultiSymbolSearchFilter` for views with `search_cache_version_key`.
+
+    Keys include a version number stored under `version_key`; `bump_version`
+    invalidates every cached result of that key at once (the old entries
+    simply expire). Cache errors are logged and treated as misses.
+    """
+
+    key_prefix = "search"
+
+    def __init__(
+        self,
+        version_key: str,
+        alias: str = None,
+        timeout: int = None,
+        max_results: int = None,
+    ):
+        self.name = version_key
+        self.version_key = f"{self.key_prefix}:version:{version_key}"
+        self.alias = settings.SEARCH_CACHE_ALIAS if alias is None else alias
+        self.timeout = settings.SEARCH_CACHE_TIMEOUT if timeout is None else timeout
+        self.max_results = (
+            settings.SEARCH_CACHE_MAX_RESULTS if max_results is None else max_results
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.alias) and self.timeout > 0
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    @staticmethod
+    def initial_version() -> int:
+        # a restarted counter must not meet results cached before an eviction
+        return time.time_ns() // 1000
+
+    def get_version(self) -> int:
+        try:
+            version = self.cache.get(self.version_key)
+            if version is None:
+                self.cache.add(self.version_key, self.initial_version(), None)
+                version = self.cache.get(self.version_key)
+            return version
+        except Exception:
+            logger.warning("Search cache version get failed", exc_info=True)
+            return None
+
+    def bump_version(self):
+        try:
+            self.cache.incr(self.version_key)
+        except ValueError:
+            # not set yet (or evicted): start from a version never used before
+            self.cache.add(self.version_key, self.initial_version(), None)
+        except Exception:
+            logger.warning("Search cache version bump failed", exc_info=True)
+
+    def make_key(self, version: int, parts: dict) -> str:
+        payload = json.dumps(parts, sort_keys=True, ensure_ascii=False)
+        digest = hashlib.sha1(payload.encode("utf-8")).hexdigest()
+        return f"{self.key_prefix}:{self.name}:{version}:{digest}"
+
+    def get(self, key):
+        try:
+            return self.cache.get(key)
+        except Exception:
+            logger.warning("Search cache get failed", exc_info=True)
+            return None
+
+    def set(self, key, value):
+        try:
+            self.cache.set(key, value, self.timeout)
+        except Exception:
+            logger.warning("Search cache set failed", exc_info=True)
@@ -0,0 +1,265 @@
+import io
+import re
+from unittest import mock
+
+from django.core.cache import caches
+from django.test import SimpleTestCase, override_settings
+
+from apps.text_services import cyrillic_latin_translator, memo
+from apps.text_services.memo import LRUCache, TransliterationCache
+
+
+class RegexWords:
+    """
+    The exception word matching `to_cyrillic` did before `WordTrie`: one
+    `re.sub(r"\\b(word)")` per dictionary key, in dictionary order.
+    `sub` has the `WordTrie.sub` interface, so it can stand in for the tries.
+    """
+
+    def __init__(self, words, spans=False):
+        self.words = words
+        # TS_WORDS / E_WORDS keys: pass the span of the first parenthesized part
+        self.spans = spans
+
+    def sub(self, repl, text):
+        for word in self.words:
+
+            def replace(match):
+                if not self.spans:
+                    return repl(match.group(1), None)
+                start = match.start(1)
+                span = (match.start(2) - start, match.end(2) - start)
+                return repl(match.group(1), span)
+
+            text = re.sub(r"\b(%s)" % word, replace, text, flags=re.U)
+        return text
+
+
+def regex_to_cyrillic(text):
+    soft_sign_words = RegexWords(cyrillic_latin_translator.SOFT_SIGN_WORDS)
+    exception_words = RegexWords(
+        [*cyrillic_latin_translator.TS_WORDS, *cyrillic_latin_translator.E_WORDS],
+        spans=True,
+    )
+    with mock.patch.object(
+        cyrillic_latin_translator, "_soft_sign_words_trie", lambda: soft_sign_words
+    ), mock.patch.object(
+        cyrillic_latin_translator, "_exception_words_trie", lambda: exception_words
+    ):
+        return cyrillic_latin_translator.to_cyrillic(text)
+
+
+def exception_words():
+    """(latin, cyrillic) pairs of TS_WORDS and E_WORDS."""
+    for words in (
+        cyrillic_latin_translator.TS_WORDS,
+        cyrillic_latin_translator.E_WORDS,
+    ):
+        for word, cyrillic in words.items():
+            yield word.replace("(", "").replace(")", ""), cyrillic
+
+
+class TranslatorTests(SimpleTestCase):
+    def test_to_cyrillic_matches_regex_matching(self):
+        words = [
+            *(latin for latin, _ in exception_words()),
+            *cyrillic_latin_translator.SOFT_SIGN_WORDS,
+        ]
+        # never at the start of the text; as a prefix, in upper case, in brackets
+        text = " ".join(f"bu {word}, {word.upper()}lar ({word})" for word in words)
+        self.assertEqual(
+            cyrillic_latin_translator.to_cyrillic(text), regex_to_cyrillic(text)
+        )
+
+    def test_to_latin_of_exception_words(self):
+        for latin, cyrillic in exception_words():
+            with self.subTest(latin):
+                self.assertEqual(
+                    cyrillic_latin_translator.to_latin(f"бу {cyrillic} ҳақида"),
+                    f"bu {latin} haqida",
+                )
+
+    def test_exception_word_after_start_of_text(self):
+        # the replaced part used to be cut at its offset in the whole text,
+        # "men aksent qildim" gave "мен аксентц қилдим"
+        cases = {
+            "men aksent qildim": "мен акцент қилдим",
+            "aksent": "акцент",
+            "Bu aksentlar va aksentlar": "Бу акцентлар ва акцентлар",
+            "u abzats yozdi": "у абзац ёзди",
+            "Yangi aksiya": "Янги акция",
+            "yangi aeroport": "янги аэропорт",
+        }
+        for latin, cyrillic in cases.items():
+            with self.subTest(latin):
+                self.assertEqual(cyrillic_latin_translator.to_cyrillic(latin), cyrillic)
+
+    def test_translate_tables_match_regex_alternation(self):
+        for mapping, table in (
+            (
+                cyrillic_latin_translator.LATIN_TO_CYRILLIC,
+                cyrillic_latin_translator.LATIN_TO_CYRILLIC_TABLE,
+            ),
+            (
+                cyrillic_latin_translator.CYRILLIC_TO_LATIN,
+                cyrillic_latin_translator.CYRILLIC_TO_LATIN_TABLE,
+            ),
+        ):
+            text = " ".join(mapping) + " 123, -?"
+            expected = re.sub(
+                "(%s)" % "|".join(map(re.escape, mapping)),
+                lambda match: mapping[match.group(1)],
+                text,
+            )
+            self.assertEqual(text.translate(table), expected)
+
+
+class ChunkedTransliterationTests(SimpleTestCase):
+    LATIN_TEXT = (
+        "Oʻzbekiston aeroportida konsert: men aksent qildim, yoʻlda\n"
+        "shoir choy ichdi va sentyabr oyida aksiya boʻldi."
+    )
+
+    def assertSameAsSinglePass(self, chunks, to_variant):
+        text = "".join(chunks)
+        self.assertEqual(
+            "".join(cyrillic_latin_translator.transliterate_chunks(chunks, to_variant)),
+            cyrillic_latin_translator.transliterate(text, to_variant),
+        )
+
+    def test_every_split_point(self):
+        # boundaries inside words, compounds (yoʻ, sh, ch) and exception words
+        cyrillic_text = cyrillic_latin_translator.to_cyrillic(self.LATIN_TEXT)
+        for to_variant, text in (
+            (cyrillic_latin_translator.CYRILLIC, self.LATIN_TEXT),
+            (cyrillic_latin_translator.LATIN, cyrillic_text),
+        ):
+            for i in range(len(text) + 1):
+                with self.subTest(to_variant=to_variant, split=i):
+                    self.assertSameAsSinglePass([text[:i], text[i:]], to_variant)
+
+    def test_chunks_without_whitespace(self):
+        chunks = ["men ak", "s", "en", "t", "", "lar q", "ildim shoi", "r"]
+        self.assertSameAsSinglePass(chunks, cyrillic_latin_translator.CYRILLIC)
+        self.assertSameAsSinglePass(
+            ["aero", "port"], cyrillic_latin_translator.CYRILLIC
+        )
+
+    def test_carry_is_bounded(self):
+        chunks = cyrillic_latin_translator.transliterate_chunks(
+            iter(["abcd", "efgh", "ijkl mn"]),
+            cyrillic_latin_translator.CYRILLIC,
+            max_carry=6,
+        )
+        # a word longer than max_carry is converted without waiting for its end
+        self.assertEqual(next(chunks), "абcдефгҳ")
+        self.assertEqual("".join(chunks), "ижкл мн")
+
+    def test_transliterate_file(self):
+        expected = cyrillic_latin_translator.to_cyrillic(self.LATIN_TEXT)
+        for chunk_size in (1, 2, 3, 7, 64, 4096):
+            with self.subTest(chunk_size=chunk_size):
+                converted = cyrillic_latin_translator.transliterate_file(
+                    io.StringIO(self.LATIN_TEXT),
+                    cyrillic_latin_translator.CYRILLIC,
+                    chunk_size=chunk_size,
+                )
+                self.assertEqual("".join(converted), expected)
+
+
+class LRUCacheTests(SimpleTestCase):
+    def test_evicts_least_recently_used(self):
+        cache = LRUCache(maxsize=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        self.assertEqual(cache.get("a"), 1)  # "b" is now the oldest
+        cache.set("c", 3)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), 1)
+        self.assertEqual(cache.get("c"), 3)
+        # setting an existing key refreshes it too
+        cache.set("a", 10)
+        cache.set("d", 4)
+        self.assertIsNone(cache.get("c"))
+        self.assertEqual(cache.get("a"), 10)
+
+    def test_counters(self):
+        cache = LRUCache(maxsize=1)
+        cache.get("a")
+        cache.set("a", 1)
+        cache.get("a")
+        cache.set("b", 2)
+        self.assertEqual(
+            cache.stats(),
+            {"size": 1, "maxsize": 1, "hits": 1, "misses": 1, "evictions": 1},
+        )
+        cache.clear()
+        self.assertEqual(cache.stats()["hits"], 0)
+        self.assertEqual(len(cache), 0)
+
+    def test_zero_size_stores_nothing(self):
+        cache = LRUCache(maxsize=0)
+        cache.set("a", 1)
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.stats()["evictions"], 0)
+
+
+@override_settings(
+    CACHES={
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+        "shared": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "transliteration-tests",
+        },
+    }
+)
+class TransliterationCacheTests(SimpleTestCase):
+    def setUp(self):
+        caches["shared"].clear()
+
+    def test_memoizes_short_texts(self):
+        cache = TransliterationCache(maxsize=10, max_length=20)
+        with mock.patch.object(
+            cyrillic_latin_translator,
+            "transliterate",
+            wraps=cyrillic_latin_translator.transliterate,
+        ) as transliterate:
+            for _ in range(2):
+                self.assertEqual(
+                    cache.transliterate("oʻzbek", cyrillic_latin_translator.CYRILLIC),
+                    "ўзбек",
+                )
+            cache.transliterate("uzun " * 10, cyrillic_latin_translator.CYRILLIC)
+        self.assertEqual(transliterate.call_count, 2)
+        self.assertEqual(cache.stats()["hits"], 1)
+        self.assertEqual(cache.stats()["size"], 1)
+
+    def test_shared_tier(self):
+        first = TransliterationCache(maxsize=10, shared_cache_alias="shared")
+        second = TransliterationCache(maxsize=10, shared_cache_alias="shared")
+        first.transliterate("sirk", cyrillic_latin_translator.CYRILLIC)
+        with mock.patch.object(
+            cyrillic_latin_translator, "transliterate"
+        ) as transliterate:
+            result = second.transliterate("sirk", cyrillic_latin_translator.CYRILLIC)
+        self.assertEqual(result, "цирк")
+        transliterate.assert_not_called()
+        self.assertEqual(second.stats()["shared_hits"], 1)
+
+    def test_shared_tier_errors_are_misses(self):
+        broken = mock.Mock()
+        broken.get.side_effect = broken.set.side_effect = ConnectionError
+        cache = TransliterationCache(maxsize=10, shared_cache_alias="shared")
+        with mock.patch.object(memo, "caches", {"shared": broken}), self.assertLogs(
+            "apps.text_services.memo", "WARNING"
+        ) as logs:
+            for _ in range(2):
+                self.assertEqual(
+                    cache.transliterate("sirk", cyrillic_latin_translator.CYRILLIC),
+                    "цирк",
+                )
+        # the second call is served by the local tier
+        broken.get.assert_called_once()
+        broken.set.assert_called_once()
+        self.assertEqual(len(logs.records), 2)
+        self.assertEqual(cache.stats()["shared_hits"], 0)
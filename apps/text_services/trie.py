@@ -0,0 +1,75 @@
+import re
+
+# Positions where a word starts, i.e. where `\b` holds before a word character.
+WORD_START_RE = re.compile(r"\b(?=\w)", flags=re.U)
+
+_END = object()
+
+
+class WordTrie:
+    """
+    Trie of dictionary words anchored at word starts.
+
+    `sub` gives the same result as `re.sub(r"\\b(word1|word2|...)", ...)` built
+    from the same words in the same order: matches are leftmost, a word may
+    end anywhere (prefix match), and when several words match at one position
+    the one inserted first wins. Only word starts are visited and each visit
+    walks at most the length of the longest word, so a scan costs
+    O(len(text)) no matter how many words the trie holds.
+    """
+
+    def __init__(self, words):
+        """`words` is an iterable of words or a mapping of word -> value."""
+        self.root = {}
+        values = words if isinstance(words, dict) else dict.fromkeys(words)
+        for priority, (word, value) in enumerate(values.items()):
+            self.add(word, value, priority)
+
+    def add(self, word, value=None, priority=0):
+        node = self.root
+        for char in word:
+            node = node.setdefault(char, {})
+        # the first insertion of a word keeps its priority, like in a regex
+        # alternation where a repeated alternative can never match
+        node.setdefault(_END, (priority, word, value))
+
+    def match(self, text, pos):
+        """Return `(word, value)` of the best word starting at `pos` or None."""
+        node = self.root
+        best = None
+        for i in range(pos, len(text)):
+            node = node.get(text[i])
+            if node is None:
+                break
+            end = node.get(_END)
+            if end is not None and (best is None or end[0] < best[0]):
+                best = end
+        if best is None:
+            return None
+        return best[1], best[2]
+
+    def finditer(self, text):
+        """Yield `(start, word, value)` for non-overlapping matches in `text`."""
+        last_end = 0
+        for start_match in WORD_START_RE.finditer(text):
+            pos = start_match.start()
+            if pos < last_end:
+                continue
+            found = self.match(text, pos)
+            if found is not None:
+                word, value = found
+                last_end = pos + len(word)
+                yield pos, word, value
+
+    def sub(self, repl, text):
+        """Replace every match with `repl(word, value)`."""
+        parts = []
+        last_end = 0
+        for start, word, value in self.finditer(text):
+            parts.append(text[last_end:start])
+            parts.append(repl(word, value))
+            last_end = start + len(word)
+        if not parts:
+            return text
+        parts.append(text[last_end:])
+        return "".join(parts)
@@ -48,6 +48,7 @@ DJANGO_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
 ]
 
 CUSTOM_APPS = [
@@ -73,7 +74,12 @@ REST_FRAMEWORK = {
         "apps.text_services.filters.MultiSymbolSearchFilter",
     ),
     "DEFAULT_RENDERER_CLASSES": (
-        "rest_framework.renderers.JSONRenderer",
+        "apps.common.renderers.ORJSONRenderer",
+    ),
+    "DEFAULT_PARSER_CLASSES": (
+        "apps.common.parsers.ORJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
     ),
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.LimitOffsetPagination",
     "PAGE_SIZE": 10,
@@ -233,6 +239,35 @@ CACHES = {
 REDIS_HOST = env.str("REDIS_HOST", "localhost")
 REDIS_PORT = env.int("REDIS_PORT", 6379)
 REDIS_DB = env.int("REDIS_DB", 0)
+REDIS_SOCKET_TIMEOUT = env.float("REDIS_SOCKET_TIMEOUT", 1.0)
+
+
+# TEXT SERVICES
+# number of memoized transliterations kept per process
+TRANSLITERATION_CACHE_SIZE = env.int("TRANSLITERATION_CACHE_SIZE", 4096)
+# longer texts (article bodies) are not memoized
+TRANSLITERATION_CACHE_MAX_LENGTH = env.int("TRANSLITERATION_CACHE_MAX_LENGTH", 256)
+# alias from CACHES shared by all workers, e.g. "default"; empty to disable
+TRANSLITERATION_SHARED_CACHE = env.str("TRANSLITERATION_SHARED_CACHE", "")
+# MultiSymbolSearchFilter backend: "contains", "fulltext" or "trigram"
+# (the last two are PostgreSQL only, other databases fall back to "contains")
+SEARCH_BACKEND = env.str("SEARCH_BACKEND", "contains")
+# pg_trgm word similarity needed by the "trigram" backend, 0..1
+SEARCH_TRIGRAM_THRESHOLD = env.float("SEARCH_TRIGRAM_THRESHOLD", 0.5)
+# most similar trigram matches kept per search
+SEARCH_TRIGRAM_MAX_RESULTS = env.int("SEARCH_TRIGRAM_MAX_RESULTS", 1000)
+# search result (id list) cache of views with `search_cache_version_key`;
+# timeout 0 disables it, larger result sets are not cached
+SEARCH_CACHE_ALIAS = env.str("SEARCH_CACHE_ALIAS", "default")
+SEARCH_CACHE_TIMEOUT = env.int("SEARCH_CACHE_TIMEOUT", 300)
+SEARCH_CACHE_MAX_RESULTS = env.int("SEARCH_CACHE_MAX_RESULTS", 1000)
+# CachedCountLimitOffsetPagination (article feeds): cached / estimated list counts,
+# timeout 0 counts exactly on every request
+PAGINATION_COUNT_CACHE = env.str("PAGINATION_COUNT_CACHE", "default")
+PAGINATION_COUNT_CACHE_TIMEOUT = env.int("PAGINATION_COUNT_CACHE_TIMEOUT", 60)
+PAGINATION_COUNT_ESTIMATE_THRESHOLD = env.int(
+    "PAGINATION_COUNT_ESTIMATE_THRESHOLD", 10000
+)
 
 
 # CELERY CONFIGURATION
@@ -244,6 +279,64 @@ CELERY_TIMEZONE = "Asia/Tashkent"
 CELERY_TASK_TRACK_STARTED = True
 CELERY_TASK_TIME_LIMIT = 30 * 60
 
+# count article views in Redis and flush them periodically (needs celery beat);
+# off: every view is an UPDATE ... RETURNING on the article row
+ARTICLE_VIEWS_BUFFERED = env.bool("ARTICLE_VIEWS_BUFFERED", True)
+# seconds between flushes of Redis-buffered article views to the database
+ARTICLE_VIEWS_FLUSH_INTERVAL = env.int("ARTICLE_VIEWS_FLUSH_INTERVAL", 30)
+# seconds between rollups of hourly article view stats into daily ones
+ARTICLE_VIEW_STATS_ROLLUP_INTERVAL = env.int(
+    "ARTICLE_VIEW_STATS_ROLLUP_INTERVAL", 60 * 60
+)
+# days hourly (ArticleViewStat) and daily (ArticleDailyViewStat) view stats are kept
+ARTICLE_VIEW_STATS_HOURLY_RETENTION = env.int("ARTICLE_VIEW_STATS_HOURLY_RETENTION", 14)
+ARTICLE_VIEW_STATS_DAILY_RETENTION = env.int(
+    "ARTICLE_VIEW_STATS_DAILY_RETENTION", 2 * 365
+)
+# per-article unique visitors counted in Redis HyperLogLogs (~12 KB per key)
+ARTICLE_UNIQUE_VISITORS = env.bool("ARTICLE_UNIQUE_VISITORS", True)
+# seconds between rollups of the HyperLogLog counts into ArticleVisitorStat
+ARTICLE_VISITORS_ROLLUP_INTERVAL = env.int("ARTICLE_VISITORS_ROLLUP_INTERVAL", 300)
+# days (today included) re-read on every rollup, must not exceed the daily key TTL (3 days)
+ARTICLE_VISITORS_ROLLUP_DAYS = 2
+# reverse proxies in front of the app that append to X-Forwarded-For; the visitor
+# address is the entry the outermost of them added (0: use REMOTE_ADDR, ignore the header)
+ARTICLE_VISITORS_TRUSTED_PROXIES = env.int("ARTICLE_VISITORS_TRUSTED_PROXIES", 0)
+# days of daily unique visitors shown in the editor article detail
+ARTICLE_VISITOR_STATS_DAYS = 30
+
+# trending articles (Redis sorted sets with exponentially decaying scores)
+ARTICLE_TRENDING = env.bool("ARTICLE_TRENDING", True)
+# seconds after which a view or comment counts half as much
+TRENDING_HALF_LIFE = env.int("TRENDING_HALF_LIFE", 6 * 60 * 60)
+TRENDING_VIEW_WEIGHT = 1
+TRENDING_COMMENT_WEIGHT = 5
+# seconds between rescales of the scores to the current time
+TRENDING_RESCALE_INTERVAL = env.int("TRENDING_RESCALE_INTERVAL", 60 * 60)
+# after a rescale, articles scoring below this (a single view ~6 half-lives ago) are dropped
+TRENDING_MIN_SCORE = 0.01
+# articles kept per sorted set
+TRENDING_MAX_SIZE = 1000
+
+CELERY_BEAT_SCHEDULE = {
+    "flush-article-views": {
+        "task": "apps.article.tasks.flush_article_views",
+        "schedule": ARTICLE_VIEWS_FLUSH_INTERVAL,
+    },
+    "rollup-article-view-stats": {
+        "task": "apps.article.tasks.rollup_article_view_stats",
+        "schedule": ARTICLE_VIEW_STATS_ROLLUP_INTERVAL,
+    },
+    "rollup-article-visitors": {
+        "task": "apps.article.tasks.rollup_article_visitors",
+        "schedule": ARTICLE_VISITORS_ROLLUP_INTERVAL,
+    },
+    "rescale-trending-scores": {
+        "task": "apps.article.tasks.rescale_trending_scores",
+        "schedule": TRENDING_RESCALE_INTERVAL,
+    },
+}
+
 # CYPHER CONFIGURATION
 # AES
 AES_KEY = env.str("AES_KEY", "")
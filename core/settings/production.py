@@ -12,6 +12,7 @@ DEBUG = False
 
 USE_X_FORWARDED_HOST = True
 SECURE_PROXY_SSL_HEADER = ("HTTP_X_FORWARDED_PROTO", "https")
+ARTICLE_VISITORS_TRUSTED_PROXIES = env.int("ARTICLE_VISITORS_TRUSTED_PROXIES", 1)
 
 CSRF_COOKIE_SECURE = True
 CSRF_TRUSTED_ORIGINS = ["https://example.com"]
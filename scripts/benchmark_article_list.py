@@ -0,0 +1,86 @@
+"""
+ArticleListSerializer va ArticleListValuesSerializer tezligini solishtiradi
+(so'rovlar + serializatsiya, JSON render'siz). Bazadagi nashr qilingan maqolalar
+ishlatiladi: butun ro'yxat va 10 talik sahifa.
+
+    python scripts/benchmark_article_list.py [--repeat 7]
+
+Natija qator/s; har bir holat uchun eng yaxshi urinish olinadi.
+"""
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+
+def setup_django():
+    import django
+    import environ
+
+    environ.Env().read_env(os.path.join(BASE_DIR, ".env"))
+    django.setup()
+
+
+def best_of(repeat, func):
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        rows = func()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return rows, best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=7)
+    args = parser.parse_args()
+    setup_django()
+
+    from rest_framework.test import APIRequestFactory
+
+    from apps.article.api_endpoints.for_readers.serializers import (
+        ArticleListSerializer,
+        ArticleListValuesSerializer,
+    )
+    from apps.article.models import Article
+
+    request = APIRequestFactory().get("/")
+    queryset = (
+        Article.objects.filter(status=Article.Status.PUBLISHED)
+        .select_related("author", "category")
+        .prefetch_related("tags")
+        .order_by("-published_at", "-pk")
+    )
+
+    def model_serializer(limit):
+        return lambda: ArticleListSerializer(
+            queryset[:limit], many=True, context={"request": request}
+        ).data
+
+    def values_serializer(limit):
+        rows = queryset.prefetch_related(None).values(
+            *ArticleListValuesSerializer.VALUES_FIELDS
+        )
+        return lambda: ArticleListValuesSerializer(
+            list(rows[:limit]), {"request": request}
+        ).data
+
+    total = queryset.count()
+    for label, limit in (("butun ro'yxat", total), ("10 talik sahifa", 10)):
+        expected, before = best_of(args.repeat, model_serializer(limit))
+        actual, after = best_of(args.repeat, values_serializer(limit))
+        rows = len(expected)
+        same = "bir xil" if [dict(item) for item in expected] == actual else "FARQ BOR"
+        print(
+            f"{label} ({rows} ta): {rows / before:,.0f} -> {rows / after:,.0f} qator/s, "
+            f"natija {same}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Compare ORJSONRenderer with DRF's JSONRenderer on article list payloads
+(render only): a page of 10 and every article in the database, both built
+by ArticleListValuesSerializer. The output of the two must be identical.
+
+    python scripts/benchmark_json_renderer.py [--repeat 7]
+"""
+import argparse
+import os
+import sys
+import timeit
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+
+def setup_django():
+    import django
+    import environ
+
+    environ.Env().read_env(os.path.join(BASE_DIR, ".env"))
+    django.setup()
+
+
+def best_of(repeat, func, number=20):
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=7)
+    args = parser.parse_args()
+    setup_django()
+
+    from rest_framework.renderers import JSONRenderer
+    from rest_framework.test import APIRequestFactory
+
+    from apps.article.api_endpoints.for_readers.serializers import (
+        ArticleListValuesSerializer,
+    )
+    from apps.article.models import Article
+    from apps.common.renderers import ORJSONRenderer
+
+    request = APIRequestFactory().get("/")
+    rows = list(
+        Article.objects.order_by("-published_at", "-pk").values(
+            *ArticleListValuesSerializer.VALUES_FIELDS
+        )
+    )
+    payloads = {
+        "page of 10": ArticleListValuesSerializer(rows[:10], {"request": request}).data,
+        f"{len(rows)} articles": ArticleListValuesSerializer(
+            rows, {"request": request}
+        ).data,
+    }
+    drf, fast = JSONRenderer(), ORJSONRenderer()
+    for label, data in payloads.items():
+        before = best_of(args.repeat, lambda: drf.render(data))
+        after = best_of(args.repeat, lambda: fast.render(data))
+        same = "identical" if drf.render(data) == fast.render(data) else "DIFFERENT"
+        print(f"{label}: {before * 1e6:,.0f}us -> {after * 1e6:,.0f}us, output {same}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Time cyrillic_latin_translator.to_cyrillic and to_latin on a short search
+query and a ~30 KB article (best of --repeat runs).
+
+    python scripts/benchmark_transliteration.py [--repeat 7]
+
+Run it on two checkouts to compare them, e.g. before and after a change to
+the translator.
+"""
+import argparse
+import sys
+import timeit
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+from apps.text_services import cyrillic_latin_translator  # noqa: E402
+
+SHORT_QUERY = "oʻzbekiston yangiliklari"
+
+# soft sign, ts/e exception words, compounds and apostrophes
+PARAGRAPH = (
+    "Oʻzbekiston Respublikasi Prezidenti poytaxtdagi aeroportda sentyabr oyida "
+    "konsert va festival oʻtkazilishini maʼlum qildi. Sirk, tsement zavodi, "
+    "aksiya va reytinglar haqida yangiliklar. Shoir gʻazal yozdi, ilm-fan "
+    "sohasida yutuqlar, unter-ofitser va aberratsion hodisalar tahlili. "
+    "Toshkent shahrida ob-havo isib, yoshlar sport maydonlarida mashgʻulot "
+    "oʻtkazmoqda.\n"
+)
+
+
+def best_of(repeat, func, number):
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=7)
+    args = parser.parse_args()
+
+    article = PARAGRAPH * (30_000 // len(PARAGRAPH.encode()) + 1)
+    cyrillic_article = cyrillic_latin_translator.to_cyrillic(article)
+    cases = [
+        (
+            "to_cyrillic, short query",
+            cyrillic_latin_translator.to_cyrillic,
+            SHORT_QUERY,
+            200,
+        ),
+        (
+            f"to_cyrillic, {len(article.encode()) // 1024} KB article",
+            cyrillic_latin_translator.to_cyrillic,
+            article,
+            3,
+        ),
+        (
+            f"to_latin, {len(cyrillic_article.encode()) // 1024} KB article",
+            cyrillic_latin_translator.to_latin,
+            cyrillic_article,
+            3,
+        ),
+    ]
+    for label, func, text, number in cases:
+        elapsed = best_of(args.repeat, lambda: func(text), number)
+        print(f"{label}: {elapsed * 1e3:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()